@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+DEFAULT_REQUEST_CONTEXT_SETTINGS = {
+    'ENABLED': False,
+    'TTL': 300,
+}
+
+# Cached in place of a row that does not exist
+MISSING = 'missing'
+
+
+def request_context_setting(name):
+    """Read a REQUEST_CONTEXT_CACHE setting, falling back to the defaults"""
+    return getattr(settings, 'REQUEST_CONTEXT_CACHE', {}).get(name, DEFAULT_REQUEST_CONTEXT_SETTINGS[name])
+
+
+def user_key(user_id):
+    return f'context:user:{user_id}'
+
+
+def cached_user(user_id):
+    """The user with this id from the shared cache, loading it on a miss; None if there is none"""
+    if not request_context_setting('ENABLED'):
+        return get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+
+    key = user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        users = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+        if not api_settings.CHECK_REVOKE_TOKEN:
+            # Keep password hashes out of the cache; save() skips deferred fields
+            users = users.defer('password')
+        user = users.first() or MISSING
+        cache.set(key, user, request_context_setting('TTL'))
+    return None if user == MISSING else user
+
+
+def forget_user(user_id):
+    """Drop a cached user now and again once the current transaction commits"""
+    cache.delete(user_key(user_id))
+    transaction.on_commit(lambda: cache.delete(user_key(user_id)))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that reads the user from the shared cache, when enabled, instead of the database"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
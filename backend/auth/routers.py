@@ -0,0 +1,104 @@
+"""
+Primary / replica routing with read-your-writes stickiness.
+
+Writes always go to the primary ('default'). Reads go to a replica only
+while ReplicaRoutingMiddleware has marked the current request as a safe
+read: a GET/HEAD/OPTIONS request from a user who has not written within the
+last STICKY_SECONDS, and only until the request itself writes. Everything
+else (unsafe methods, management commands, job workers) reads the primary.
+
+The recent-write pin is kept in the default cache, so it must be shared
+between workers; settings refuse replicas without REDIS_URL.
+"""
+import random
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+DEFAULT_REPLICATION_SETTINGS = {
+    'STICKY_SECONDS': 15,
+}
+
+# Per request (thread or async task) routing state
+_state = Local()
+
+
+def replication_setting(name):
+    """Read a DATABASE_REPLICATION setting, falling back to the defaults"""
+    return getattr(settings, 'DATABASE_REPLICATION', {}).get(name, DEFAULT_REPLICATION_SETTINGS[name])
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def sticky_key(user_id):
+    return f'db:sticky:{user_id}'
+
+
+class PrimaryReplicaRouter:
+    """Send safe-request reads to a random replica and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if getattr(_state, 'use_replica', False) and not getattr(_state, 'wrote', False):
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if getattr(_state, 'use_replica', None) is not None:
+            # Later reads in this request, and the user's next requests, must see the write
+            _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary's rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Mark safe requests as replica reads unless their user wrote recently.
+
+    The user is read from the JWT without verifying it against the database,
+    which is enough to pick a database; authentication still happens in DRF.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user_id = self.token_user_id(request)
+        _state.wrote = False
+        _state.use_replica = (
+            request.method in SAFE_METHODS
+            and not (user_id is not None and cache.get(sticky_key(user_id)))
+        )
+        try:
+            response = self.get_response(request)
+            if _state.wrote and user_id is not None:
+                cache.set(sticky_key(user_id), True, replication_setting('STICKY_SECONDS'))
+            return response
+        finally:
+            # Outside a request, such as in commands and job workers, writes are not tracked
+            _state.use_replica = None
+            _state.wrote = False
+
+    def token_user_id(self, request):
+        header = request.META.get(api_settings.AUTH_HEADER_NAME, '').split()
+        if len(header) != 2 or header[0] not in api_settings.AUTH_HEADER_TYPES:
+            return None
+        try:
+            return AccessToken(header[1]).get(api_settings.USER_ID_CLAIM)
+        except TokenError:
+            return None
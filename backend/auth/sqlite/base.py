@@ -0,0 +1,35 @@
+"""
+Django's SQLite backend with the transaction_mode option of Django 5.1.
+
+Django 5.0 opens atomic blocks with a plain BEGIN, which defers taking the
+write lock to the first write. Under WAL a transaction that has already read
+cannot wait for that lock: SQLite fails it with SQLITE_BUSY at once,
+whatever busy_timeout says. With OPTIONS['transaction_mode'] = 'IMMEDIATE'
+atomic blocks take the lock up front, where busy_timeout does apply.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'EXCLUSIVE', 'IMMEDIATE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def transaction_mode(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        if mode is not None and mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"settings.DATABASES['{self.alias}']['OPTIONS']['transaction_mode'] is improperly "
+                f"configured. Use one of {', '.join(map(repr, TRANSACTION_MODES))}, or None."
+            )
+        return mode.upper() if mode is not None else None
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # Not a sqlite3.connect() argument
+        kwargs.pop('transaction_mode', None)
+        return kwargs
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.transaction_mode
+        self.cursor().execute('BEGIN' if mode is None else f'BEGIN {mode}')
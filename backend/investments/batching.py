@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SETTINGS = {
+    'ENABLED': False,
+    'MAX_BATCH_SIZE': 8,
+    'WINDOW_MS': 100,
+    'MAX_IN_FLIGHT': 4,
+    'TIMEOUT': 60,
+}
+
+
+def batch_setting(name):
+    """Read a RECOMMENDATION_BATCHING setting, falling back to the defaults"""
+    return getattr(settings, 'RECOMMENDATION_BATCHING', {}).get(name, DEFAULT_BATCH_SETTINGS[name])
+
+
+class RecommendationBatcher:
+    """
+    Coalesces items submitted within a short window into one handler call.
+
+    The handler receives a list of items and must return one result per item,
+    in order. A batch is dispatched when it is full or when its oldest item
+    has waited for the window, whichever comes first.
+    """
+
+    def __init__(self, handler, max_batch_size, window_ms, max_in_flight):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self._queue = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='recommendation-batch')
+        self._metrics_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.full_batches = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def from_settings(cls, handler):
+        return cls(
+            handler,
+            max_batch_size=batch_setting('MAX_BATCH_SIZE'),
+            window_ms=batch_setting('WINDOW_MS'),
+            max_in_flight=batch_setting('MAX_IN_FLIGHT'),
+        )
+
+    def submit(self, item):
+        """Queue an item and return a Future for its result"""
+        future = Future()
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect, name='recommendation-batcher', daemon=True)
+                self._thread.start()
+            self._queue.append((item, future, time.monotonic()))
+            self._condition.notify()
+        return future
+
+    def _collect(self):
+        """Form batches forever, handing each to the executor"""
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+
+                deadline = self._queue[0][2] + self.window
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+
+            self._record(batch)
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch):
+        try:
+            self._resolve(batch)
+        finally:
+            # The handler's queries opened connections for this pool thread,
+            # which no request cycle will close
+            connections.close_all()
+
+    def _resolve(self, batch):
+        try:
+            results = self.handler([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"Recommendation batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _record(self, batch):
+        """Track batch fill and how long items waited for their batch"""
+        dispatched_at = time.monotonic()
+        waits = [dispatched_at - enqueued_at for _, _, enqueued_at in batch]
+        with self._metrics_lock:
+            self.batches += 1
+            self.requests += len(batch)
+            if len(batch) >= self.max_batch_size:
+                self.full_batches += 1
+            self.total_wait += sum(waits)
+            self.max_wait = max(self.max_wait, *waits)
+
+    def stats(self):
+        with self._metrics_lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'window_ms': round(self.window * 1000),
+                'batches': self.batches,
+                'requests': self.requests,
+                'full_batches': self.full_batches,
+                'average_batch_size': round(self.requests / self.batches, 2) if self.batches else 0.0,
+                'fill_rate': round(self.requests / (self.batches * self.max_batch_size), 4) if self.batches else 0.0,
+                'average_added_latency_ms': round(self.total_wait / self.requests * 1000, 2) if self.requests else 0.0,
+                'max_added_latency_ms': round(self.max_wait * 1000, 2),
+            }
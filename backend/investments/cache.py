@@ -0,0 +1,161 @@
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal, ROUND_DOWN
+from django.conf import settings
+
+DEFAULT_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 1000,
+    'TTL': 6 * 60 * 60,
+    'AGE_BUCKET': 5,
+    'MONEY_BUCKET_RATIO': 1.25,
+    'TIMELINE_BUCKET': 12,
+}
+
+# Words that carry no meaning for recommendations and only fragment the cache
+GOAL_STOPWORDS = {
+    'a', 'an', 'and', 'the', 'to', 'for', 'of', 'in', 'on', 'my', 'i', 'me', 'we', 'our',
+    'want', 'would', 'like', 'some', 'with', 'be', 'is', 'it', 'so', 'that', 'this',
+    'na', 'ya', 'wa', 'kwa', 'za', 'la', 'cha', 'nataka',
+}
+
+CENT = Decimal('0.01')
+
+
+def cache_setting(name):
+    """Read a RECOMMENDATION_CACHE setting, falling back to the defaults"""
+    return getattr(settings, 'RECOMMENDATION_CACHE', {}).get(name, DEFAULT_CACHE_SETTINGS[name])
+
+
+def normalize_goals(text):
+    """Reduce free-text goals to a sorted set of meaningful lowercase words"""
+    words = re.findall(r'[a-z0-9]+', (text or '').lower())
+    return ' '.join(sorted({word for word in words if word not in GOAL_STOPWORDS}))
+
+
+def money_bucket(amount):
+    """Geometric bucket for a money amount, so buckets widen as amounts grow"""
+    amount = float(amount or 0)
+    if amount <= 1:
+        return 0
+    return int(math.log(amount) / math.log(cache_setting('MONEY_BUCKET_RATIO')))
+
+
+def profile_fingerprint(profile):
+    """Cache key shared by profiles that should receive the same recommendations"""
+    goals_hash = hashlib.sha1(normalize_goals(profile.financial_goals).encode('utf-8')).hexdigest()[:16]
+    return (
+        profile.risk_tolerance,
+        int(profile.age) // cache_setting('AGE_BUCKET'),
+        money_bucket(profile.monthly_income),
+        money_bucket(profile.investment_amount),
+        int(profile.investment_timeline) // cache_setting('TIMELINE_BUCKET'),
+        goals_hash,
+    )
+
+
+class RecommendationCache:
+    """
+    Thread-safe LRU cache of recommendation sets keyed by profile fingerprint.
+
+    Recommended amounts are stored as fractions of the original profile's
+    investment amount and rescaled to the requesting profile on a hit.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_settings(cls):
+        return cls(max_entries=cache_setting('MAX_ENTRIES'), ttl=cache_setting('TTL'))
+
+    def get(self, profile):
+        """Return recommendations rescaled to profile, or None on a miss"""
+        key = profile_fingerprint(profile)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            allocations = entry[1]
+
+        return rescale_allocations(allocations, profile.investment_amount)
+
+    def put(self, profile, recommendations):
+        """Store a recommendation set generated for profile"""
+        if profile.investment_amount <= 0 or not recommendations:
+            return
+
+        allocations = []
+        for rec in recommendations:
+            allocation = dict(rec)
+            allocation['allocation'] = Decimal(rec['recommended_amount']) / profile.investment_amount
+            del allocation['recommended_amount']
+            allocations.append(allocation)
+
+        key = profile_fingerprint(profile)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, allocations)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+def rescale_allocations(allocations, investment_amount):
+    """Turn cached allocation fractions back into amounts for investment_amount"""
+    recommendations = []
+    total = Decimal('0')
+
+    for allocation in allocations:
+        rec = dict(allocation)
+        amount = (rec.pop('allocation') * investment_amount).quantize(CENT, rounding=ROUND_DOWN)
+        # Never hand out more than the profile has available
+        amount = min(amount, investment_amount - total)
+        if amount <= 0:
+            continue
+        rec['recommended_amount'] = amount
+        total += amount
+        recommendations.append(rec)
+
+    return recommendations
+
+
+recommendation_cache = RecommendationCache.from_settings()
@@ -0,0 +1,79 @@
+import threading
+import time
+from django.conf import settings
+from .models import Investment, canonical_investment_name
+
+DEFAULT_CATALOG_SETTINGS = {
+    'TTL': 300,
+}
+
+
+def catalog_setting(name):
+    """Read an INVESTMENT_CATALOG_CACHE setting, falling back to the defaults"""
+    return getattr(settings, 'INVESTMENT_CATALOG_CACHE', {}).get(name, DEFAULT_CATALOG_SETTINGS[name])
+
+
+class InvestmentCatalog:
+    """
+    Process-local map of Investment canonical names to primary keys.
+
+    The whole map is loaded with one query on first use. Save and delete
+    signals keep it current within this process, and a TTL bounds how long
+    changes made by other processes can go unseen. Only ids are cached, so
+    callers must confirm a hit against the database before relying on it:
+    another process may have deleted or renamed the row.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._ids = {}
+        self._names = {}
+        self._loaded_at = None
+        self._lock = threading.RLock()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            rows = list(Investment.objects.order_by('id').values_list('id', 'canonical_name'))
+            self._ids = {name: investment_id for investment_id, name in rows}
+            self._names = dict(rows)
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def lookup(self, names):
+        """Map each of names that is in the catalog to its Investment id"""
+        self._ensure_loaded()
+        found = {}
+        for name in names:
+            investment_id = self._ids.get(canonical_investment_name(name))
+            if investment_id is not None:
+                found[name] = investment_id
+        return found
+
+    def store(self, investments):
+        """Add or refresh entries, e.g. after a save or a bulk insert"""
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            for investment in investments:
+                stale = self._names.get(investment.id)
+                if stale is not None and stale != investment.canonical_name:
+                    self._ids.pop(stale, None)
+                self._ids[investment.canonical_name] = investment.id
+                self._names[investment.id] = investment.canonical_name
+
+    def discard(self, investment):
+        """Drop an entry, e.g. after a delete or when a cached id no longer resolves"""
+        with self._lock:
+            name = self._names.pop(investment.id, None)
+            if name is not None and self._ids.get(name) == investment.id:
+                del self._ids[name]
+
+
+investment_catalog = InvestmentCatalog(ttl=catalog_setting('TTL'))
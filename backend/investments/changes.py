@@ -0,0 +1,56 @@
+from decimal import Decimal
+from difflib import SequenceMatcher
+from django.conf import settings
+from .cache import normalize_goals
+
+DEFAULT_REGENERATION_SETTINGS = {
+    'AMOUNT_THRESHOLD': 0.05,
+    'INCOME_THRESHOLD': 0.05,
+    'GOALS_SIMILARITY': 0.9,
+}
+
+# Profile fields whose any change affects recommendations
+EXACT_FIELDS = ('age', 'risk_tolerance', 'investment_timeline')
+
+# Money fields compared relative to their current value, with their threshold setting
+RELATIVE_FIELDS = {
+    'investment_amount': 'AMOUNT_THRESHOLD',
+    'monthly_income': 'INCOME_THRESHOLD',
+}
+
+
+def regeneration_setting(name):
+    """Read a RECOMMENDATION_REGENERATION setting, falling back to the defaults"""
+    return getattr(settings, 'RECOMMENDATION_REGENERATION', {}).get(name, DEFAULT_REGENERATION_SETTINGS[name])
+
+
+def relative_change(old, new):
+    """Fractional change from old to new"""
+    old, new = Decimal(old or 0), Decimal(new or 0)
+    if old == 0:
+        return Decimal('0') if new == 0 else Decimal('1')
+    return abs(new - old) / old
+
+
+def goals_changed(old, new):
+    """Whether goals differ by more than word order, filler words or a small typo"""
+    old, new = normalize_goals(old), normalize_goals(new)
+    if old == new:
+        return False
+    return SequenceMatcher(None, old, new).ratio() < regeneration_setting('GOALS_SIMILARITY')
+
+
+def material_changes(profile, data):
+    """Names of the fields in data that would change the profile's recommendations"""
+    changed = [
+        field for field in EXACT_FIELDS
+        if field in data and data[field] != getattr(profile, field)
+    ]
+    changed += [
+        field for field, threshold in RELATIVE_FIELDS.items()
+        if field in data
+        and relative_change(getattr(profile, field), data[field]) > Decimal(str(regeneration_setting(threshold)))
+    ]
+    if 'financial_goals' in data and goals_changed(profile.financial_goals, data['financial_goals']):
+        changed.append('financial_goals')
+    return changed
@@ -0,0 +1,48 @@
+"""
+The authenticated user's risk profile, resolved once per request.
+
+When REQUEST_CONTEXT_CACHE is enabled, profiles are cached in the shared
+cache by user id next to the users cached by auth.authentication, and dropped
+by the RiskProfile save and delete signals, so a warm authenticated read needs
+no query to find either.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from auth.authentication import MISSING, request_context_setting
+from .models import RiskProfile
+
+
+def profile_key(user_id):
+    return f'context:profile:{user_id}'
+
+
+def request_profile(request):
+    """The request user's RiskProfile, or None if they have not created one"""
+    if not hasattr(request, '_risk_profile'):
+        request._risk_profile = cached_profile(request.user)
+    return request._risk_profile
+
+
+def cached_profile(user):
+    if not request_context_setting('ENABLED'):
+        profile = RiskProfile.objects.filter(user=user).order_by('id').first()
+        if profile is not None:
+            profile.user = user
+        return profile
+
+    key = profile_key(user.pk)
+    profile = cache.get(key)
+    if profile is None:
+        profile = RiskProfile.objects.filter(user=user).order_by('id').first() or MISSING
+        cache.set(key, profile, request_context_setting('TTL'))
+    if profile == MISSING:
+        return None
+    # Serializers nest the user; reuse the request's instance instead of a stale copy
+    profile.user = user
+    return profile
+
+
+def forget_profile(user_id):
+    """Drop a cached profile now and again once the current transaction commits"""
+    cache.delete(profile_key(user_id))
+    transaction.on_commit(lambda: cache.delete(profile_key(user_id)))
@@ -0,0 +1,319 @@
+import logging
+import re
+import threading
+import time
+from decimal import Decimal, ROUND_DOWN
+import numpy as np
+from django.conf import settings
+from .models import Investment, RiskProfile
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal('0.01')
+
+TYPES = [code for code, _ in Investment.INVESTMENT_TYPES]
+RISK_LEVELS = [code for code, _ in RiskProfile.RISK_LEVELS]
+
+# Per-type traits on a 0-1 scale, in the order of Investment.INVESTMENT_TYPES
+TYPE_LIQUIDITY = np.array([0.6, 0.6, 0.2, 1.0, 0.8, 0.7, 0.3, 0.3, 0.7])
+TYPE_GROWTH = np.array([0.9, 0.4, 0.8, 0.2, 0.6, 0.3, 0.7, 0.6, 1.0])
+TYPE_VOLATILITY = np.array([0.7, 0.2, 0.5, 0.1, 0.4, 0.05, 0.6, 0.6, 1.0])
+
+# Goal keywords (English and Swahili) and the investment types they point to
+GOAL_KEYWORDS = {
+    'stocks': ['stock', 'stocks', 'shares', 'nse', 'equity', 'hisa', 'wealth', 'grow'],
+    'bonds': ['bond', 'bonds', 'retire', 'retirement', 'pension', 'income', 'dhamana', 'kustaafu'],
+    'real_estate': ['house', 'home', 'land', 'plot', 'property', 'rent', 'nyumba', 'shamba', 'ardhi'],
+    'money_market': ['emergency', 'save', 'savings', 'safe', 'school', 'fees', 'education', 'akiba', 'dharura', 'ada'],
+    'mutual_funds': ['diversify', 'diversified', 'fund', 'funds', 'children', 'education', 'mfuko'],
+    'fixed_deposit': ['guaranteed', 'fixed', 'secure', 'wedding', 'amana'],
+    'business': ['business', 'sacco', 'shop', 'chama', 'biashara', 'duka'],
+    'agriculture': ['farm', 'farming', 'agriculture', 'dairy', 'poultry', 'kilimo', 'mifugo'],
+    'digital_assets': ['crypto', 'bitcoin', 'blockchain', 'digital', 'kidijitali'],
+}
+
+# Built-in products used when the Investment catalog is empty
+SEED_CATALOG = [
+    {
+        'name': 'Money Market Fund - Conservative',
+        'type': 'money_market',
+        'minimum_amount': Decimal('1000'),
+        'expected_return': Decimal('7.5'),
+        'risk_level': 'conservative',
+        'description': 'Low-risk investment in short-term securities with stable returns',
+        'local_description': 'Uwekezaji wa hatari kidogo katika dhamana za muda mfupi',
+    },
+    {
+        'name': 'Fixed Deposit Account',
+        'type': 'fixed_deposit',
+        'minimum_amount': Decimal('5000'),
+        'expected_return': Decimal('9.0'),
+        'risk_level': 'conservative',
+        'description': 'Fixed-term deposits with guaranteed returns',
+        'local_description': 'Amana za muda maalum na mapato ya hakika',
+    },
+    {
+        'name': 'Balanced Mutual Fund',
+        'type': 'mutual_funds',
+        'minimum_amount': Decimal('2000'),
+        'expected_return': Decimal('12.0'),
+        'risk_level': 'moderate',
+        'description': 'Diversified portfolio of stocks and bonds',
+        'local_description': 'Mfuko wa uwekezaji wenye mchanganyiko wa hisa na dhamana',
+    },
+    {
+        'name': 'SACCO Investment Shares',
+        'type': 'business',
+        'minimum_amount': Decimal('1000'),
+        'expected_return': Decimal('15.0'),
+        'risk_level': 'moderate',
+        'description': 'Cooperative society investment with annual dividends',
+        'local_description': 'Uwekezaji katika shirika la ushirika na mgao wa kila mwaka',
+    },
+    {
+        'name': 'NSE Equity Fund',
+        'type': 'stocks',
+        'minimum_amount': Decimal('5000'),
+        'expected_return': Decimal('18.0'),
+        'risk_level': 'aggressive',
+        'description': 'Investment in Nairobi Securities Exchange listed companies',
+        'local_description': 'Uwekezaji katika makampuni yaliyoorodheshwa NSE',
+    },
+    {
+        'name': 'Real Estate Investment Trust',
+        'type': 'real_estate',
+        'minimum_amount': Decimal('10000'),
+        'expected_return': Decimal('16.0'),
+        'risk_level': 'aggressive',
+        'description': 'Investment in commercial and residential properties',
+        'local_description': 'Uwekezaji katika mali za kibiashara na za makazi',
+    },
+]
+
+DEFAULT_ENGINE_SETTINGS = {
+    'MAX_RECOMMENDATIONS': 4,
+    'MAX_PER_TYPE': 2,
+    # Seconds the catalog matrix is reused; bounds how long changes made by
+    # other processes, which send this one no signals, go unseen
+    'CATALOG_TTL': 300,
+}
+
+
+def engine_setting(name):
+    """Read a LOCAL_RECOMMENDATION_ENGINE setting, falling back to the defaults"""
+    return getattr(settings, 'LOCAL_RECOMMENDATION_ENGINE', {}).get(name, DEFAULT_ENGINE_SETTINGS[name])
+
+
+class CatalogMatrix:
+    """Column-oriented snapshot of the investment catalog for vectorized scoring"""
+
+    def __init__(self, products):
+        self.products = products
+        self.type_index = np.array([TYPES.index(p['type']) if p['type'] in TYPES else TYPES.index('mutual_funds') for p in products], dtype=np.intp)
+        self.type_onehot = np.eye(len(TYPES))[self.type_index]
+        self.risk = np.array([RISK_LEVELS.index(p['risk_level']) if p['risk_level'] in RISK_LEVELS else 1 for p in products], dtype=float)
+        self.expected_return = np.array([float(p['expected_return']) for p in products])
+        self.minimum_amount = np.array([float(p['minimum_amount']) for p in products])
+        self.liquidity = self.type_onehot @ TYPE_LIQUIDITY
+        self.growth = self.type_onehot @ TYPE_GROWTH
+        self.volatility = self.type_onehot @ TYPE_VOLATILITY
+        top_return = self.expected_return.max() if len(products) else 0
+        self.relative_return = self.expected_return / top_return if top_return > 0 else np.zeros(len(products))
+
+    def __len__(self):
+        return len(self.products)
+
+
+def goal_affinity(financial_goals):
+    """Per-type affinity vector from keywords found in the goals text"""
+    words = set(re.findall(r'[a-z]+', (financial_goals or '').lower()))
+    affinity = np.array([len(words.intersection(GOAL_KEYWORDS[code])) for code in TYPES], dtype=float)
+    return np.minimum(affinity, 1.0)
+
+
+class LocalRecommendationEngine:
+    """
+    Deterministic, network-free recommendation engine.
+
+    Scores every active Investment against a profile with vectorized NumPy
+    operations over a catalog matrix cached for CATALOG_TTL seconds, then
+    splits the profile's investment amount across the best candidates it can
+    afford, or puts all of it in the cheapest product when it can afford none.
+    """
+
+    def __init__(self):
+        # (matrix, monotonic load time), swapped as one reference
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop the catalog matrix so the next call reloads it"""
+        self._loaded = None
+
+    def _fresh(self, loaded):
+        return loaded is not None and time.monotonic() - loaded[1] < engine_setting('CATALOG_TTL')
+
+    def catalog(self):
+        loaded = self._loaded
+        if not self._fresh(loaded):
+            with self._lock:
+                loaded = self._loaded
+                if not self._fresh(loaded):
+                    loaded = self._loaded = (self._load_catalog(), time.monotonic())
+        return loaded[0]
+
+    def _load_catalog(self):
+        products = list(Investment.objects.filter(is_active=True).order_by('id').values(
+            'name', 'type', 'minimum_amount', 'expected_return', 'risk_level',
+            'description', 'local_description'
+        ))
+        if not products:
+            logger.info("Investment catalog is empty, using the built-in seed catalog")
+            products = [dict(product) for product in SEED_CATALOG]
+        return CatalogMatrix(products)
+
+    def score(self, profile, matrix):
+        """Suitability score of every catalog product for profile (-inf if unaffordable)"""
+        risk = RISK_LEVELS.index(profile.risk_tolerance) if profile.risk_tolerance in RISK_LEVELS else 1
+        timeline = float(profile.investment_timeline)
+        age = float(profile.age)
+
+        risk_fit = 1 - np.abs(matrix.risk - risk) / 2
+        return_weight = (0.1, 0.25, 0.4)[risk]
+        liquidity_weight = np.clip((36 - timeline) / 36, 0, 1) * 0.3
+        growth_weight = np.clip(timeline / 120, 0, 1) * 0.2
+        stability_weight = np.clip((age - 40) / 40, 0, 1) * 0.2
+        affinity = goal_affinity(profile.financial_goals)
+
+        scores = (
+            0.4 * risk_fit
+            + return_weight * matrix.relative_return
+            + liquidity_weight * matrix.liquidity
+            + growth_weight * matrix.growth
+            + stability_weight * (1 - matrix.volatility)
+            + 0.25 * (matrix.type_onehot @ affinity)
+        )
+        return np.where(matrix.minimum_amount <= float(profile.investment_amount), scores, -np.inf)
+
+    def select(self, scores, matrix):
+        """Indices of the best candidates, at most MAX_PER_TYPE of each type"""
+        limit = engine_setting('MAX_RECOMMENDATIONS')
+        per_type = engine_setting('MAX_PER_TYPE')
+        chosen, type_counts = [], {}
+
+        # Stable sort keeps ties in catalog order, so results are deterministic
+        for index in np.argsort(-scores, kind='stable'):
+            if not np.isfinite(scores[index]) or len(chosen) >= limit:
+                break
+            type_index = matrix.type_index[index]
+            if type_counts.get(type_index, 0) >= per_type:
+                continue
+            type_counts[type_index] = type_counts.get(type_index, 0) + 1
+            chosen.append(index)
+
+        return np.array(chosen, dtype=np.intp)
+
+    def allocate(self, scores, minimums, budget):
+        """
+        Split budget across candidates in proportion to score.
+
+        Candidates whose share falls below their minimum amount are dropped
+        (lowest score first) and the budget is re-split among the rest.
+        """
+        keep = np.ones(len(scores), dtype=bool)
+        while keep.any():
+            weights = np.where(keep, scores - scores[keep].min() + 0.1, 0)
+            amounts = budget * weights / weights.sum()
+            short = keep & (amounts < minimums)
+            if not short.any():
+                return amounts
+            # Drop the weakest candidate that cannot meet its minimum
+            keep[np.flatnonzero(short)[-1]] = False
+        return np.zeros(len(scores))
+
+    def recommend(self, profile):
+        """Recommendations for profile in the same shape as the AI path"""
+        matrix = self.catalog()
+        budget = profile.investment_amount
+        if not len(matrix) or budget <= 0:
+            return []
+
+        scores = self.score(profile, matrix)
+        chosen = self.select(scores, matrix)
+        if not len(chosen):
+            return [self.below_minimums(profile, matrix)]
+
+        amounts = self.allocate(scores[chosen], matrix.minimum_amount[chosen], float(budget))
+        finite = scores[np.isfinite(scores)]
+        spread = finite.max() - finite.min()
+
+        recommendations = []
+        total = Decimal('0')
+        for index, amount in zip(chosen, amounts):
+            amount = min(Decimal(str(amount)).quantize(CENT, rounding=ROUND_DOWN), budget - total)
+            if amount <= 0:
+                continue
+            total += amount
+
+            relative = (scores[index] - finite.min()) / spread if spread > 0 else 1.0
+            rationale = self.rationale(profile, matrix.products[index], matrix.type_index[index])
+            recommendations.append(self.recommendation(matrix, index, amount, rationale, round(0.5 + 0.45 * float(relative), 2)))
+
+        # Rounding leftovers go to the strongest recommendation
+        if recommendations and total < budget:
+            recommendations[0]['recommended_amount'] += budget - total
+
+        return recommendations
+
+    def below_minimums(self, profile, matrix):
+        """
+        The whole budget in the cheapest product, for a budget below every minimum.
+
+        Ties go to the earliest product in the catalog. The rationale names the
+        minimum to save towards, so the profile still gets a starting point
+        rather than no recommendations.
+        """
+        index = int(np.argmin(matrix.minimum_amount))
+        product = matrix.products[index]
+        rationale = (
+            f"{product['name']} has the lowest minimum investment available; "
+            f"build up to its {Decimal(product['minimum_amount']):,.0f} minimum to open a position."
+        )
+        return self.recommendation(matrix, index, profile.investment_amount, rationale, 0.5)
+
+    def recommendation(self, matrix, index, amount, rationale, confidence_score):
+        """One recommendation in the shape of the AI path"""
+        product = matrix.products[index]
+        return {
+            'name': product['name'],
+            'type': product['type'],
+            'minimum_amount': Decimal(product['minimum_amount']),
+            'expected_return': Decimal(product['expected_return']),
+            'risk_level': product['risk_level'],
+            'description': product['description'],
+            'local_description': product['local_description'],
+            'recommended_amount': amount,
+            'rationale': rationale,
+            'confidence_score': confidence_score,
+        }
+
+    def rationale(self, profile, product, type_index):
+        """Short explanation of why a product suits the profile"""
+        reasons = []
+        if product['risk_level'] == profile.risk_tolerance:
+            reasons.append(f"matches your {profile.risk_tolerance} risk tolerance")
+        else:
+            reasons.append(f"adds {product['risk_level']} exposure alongside your {profile.risk_tolerance} risk tolerance")
+
+        if profile.investment_timeline < 12 and TYPE_LIQUIDITY[type_index] >= 0.7:
+            reasons.append("stays accessible within your short timeline")
+        elif profile.investment_timeline >= 60 and TYPE_GROWTH[type_index] >= 0.6:
+            reasons.append(f"has room to grow over {profile.investment_timeline_years} years")
+
+        if goal_affinity(profile.financial_goals)[type_index]:
+            reasons.append("supports the goals you described")
+
+        return f"{product['name']} {', '.join(reasons[:-1])}{' and ' if len(reasons) > 1 else ''}{reasons[-1]}."
+
+
+local_engine = LocalRecommendationEngine()
@@ -0,0 +1,141 @@
+import logging
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Count, F, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import LessThan
+from django.utils import timezone
+from .models import RecommendationJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_SETTINGS = {
+    'ENABLED': False,
+    'MAX_ATTEMPTS': 3,
+    'VISIBILITY_TIMEOUT': 120,
+    'CONCURRENCY': 4,
+    'RETRY_BACKOFF': 5,
+    'POLL_INTERVAL': 1.0,
+}
+
+
+def job_setting(name):
+    """Read a RECOMMENDATION_JOBS setting, falling back to the defaults"""
+    return getattr(settings, 'RECOMMENDATION_JOBS', {}).get(name, DEFAULT_JOB_SETTINGS[name])
+
+
+def enqueue_recommendation_job(profile):
+    """Queue recommendation generation for a saved risk profile"""
+    job = RecommendationJob.objects.create(
+        risk_profile=profile,
+        max_attempts=job_setting('MAX_ATTEMPTS'),
+    )
+    logger.info(f"Enqueued recommendation job {job.id} for profile {profile.id}")
+    return job
+
+
+def _claimable(now):
+    """Pending jobs that are due, plus running jobs whose visibility timeout expired"""
+    return (
+        Q(status=RecommendationJob.STATUS_PENDING, run_after__lte=now) |
+        Q(status=RecommendationJob.STATUS_RUNNING, locked_until__lte=now)
+    )
+
+
+def expire_exhausted_jobs():
+    """Fail jobs whose lease expired after their last allowed attempt"""
+    now = timezone.now()
+    return RecommendationJob.objects.filter(
+        status=RecommendationJob.STATUS_RUNNING,
+        locked_until__lte=now,
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status=RecommendationJob.STATUS_FAILED,
+        locked_until=None,
+        last_error='Visibility timeout expired on final attempt',
+        updated_at=now,
+    )
+
+
+def claim_next_job(worker_id):
+    """
+    Claim the next due job for worker_id, or return None.
+
+    A claim is a conditional UPDATE, so concurrent workers can never hold the
+    same job. Claims are refused while CONCURRENCY jobs already hold a lease;
+    the lease count is part of the same UPDATE, so parallel workers cannot
+    both pass the check and go over the limit.
+    """
+    expire_exhausted_jobs()
+    now = timezone.now()
+
+    leases = RecommendationJob.objects.filter(
+        status=RecommendationJob.STATUS_RUNNING,
+        locked_until__gt=now,
+    )
+    # Cheap early exit; the UPDATE below checks the limit again atomically
+    if leases.count() >= job_setting('CONCURRENCY'):
+        return None
+
+    leased = leases.order_by().values('status').annotate(count=Count('id')).values('count')
+    below_limit = LessThan(Coalesce(Subquery(leased), 0), job_setting('CONCURRENCY'))
+
+    candidates = RecommendationJob.objects.filter(_claimable(now)).values_list('id', flat=True)[:10]
+    lease = timedelta(seconds=job_setting('VISIBILITY_TIMEOUT'))
+
+    for job_id in candidates:
+        claimed = RecommendationJob.objects.filter(_claimable(now), below_limit, id=job_id).update(
+            status=RecommendationJob.STATUS_RUNNING,
+            attempts=F('attempts') + 1,
+            locked_until=now + lease,
+            locked_by=worker_id,
+            updated_at=now,
+        )
+        if claimed:
+            return RecommendationJob.objects.select_related('risk_profile').get(id=job_id)
+
+    return None
+
+
+def complete_job(job, recommendation_ids):
+    """Mark a claimed job as succeeded; ignored if the lease was lost"""
+    updated = RecommendationJob.objects.filter(
+        id=job.id,
+        status=RecommendationJob.STATUS_RUNNING,
+        locked_by=job.locked_by,
+    ).update(
+        status=RecommendationJob.STATUS_SUCCEEDED,
+        result=list(recommendation_ids),
+        locked_until=None,
+        last_error='',
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        logger.warning(f"Recommendation job {job.id} lost its lease before completing")
+    return bool(updated)
+
+
+def fail_job(job, error):
+    """Schedule a retry with jittered backoff, or fail the job for good"""
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        status, run_after = RecommendationJob.STATUS_FAILED, job.run_after
+    else:
+        delay = job_setting('RETRY_BACKOFF') * (2 ** (job.attempts - 1))
+        status = RecommendationJob.STATUS_PENDING
+        run_after = now + timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+    RecommendationJob.objects.filter(
+        id=job.id,
+        status=RecommendationJob.STATUS_RUNNING,
+        locked_by=job.locked_by,
+    ).update(
+        status=status,
+        run_after=run_after,
+        locked_until=None,
+        last_error=str(error),
+        updated_at=now,
+    )
+    logger.error(f"Recommendation job {job.id} attempt {job.attempts} failed: {error}")
+    return status
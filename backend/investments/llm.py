@@ -0,0 +1,265 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import httpx
+import openai
+from openai import OpenAI
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_SETTINGS = {
+    'BASE_URL': '',
+    'DEADLINE': 30.0,
+    'TIMEOUT': 20.0,
+    'CONNECT_TIMEOUT': 3.0,
+    'MAX_RETRIES': 2,
+    'RETRY_BACKOFF': 0.5,
+    'HEDGE_DELAY': 0.0,
+    'POOL_SIZE': 10,
+    'KEEPALIVE_EXPIRY': 30.0,
+    'BREAKER_FAILURE_THRESHOLD': 5,
+    'BREAKER_RESET_TIMEOUT': 30.0,
+}
+
+# Failures worth retrying: the request may succeed if sent again
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    TimeoutError,
+)
+
+
+def llm_setting(name):
+    """Read an LLM_CLIENT setting, falling back to the defaults"""
+    return getattr(settings, 'LLM_CLIENT', {}).get(name, DEFAULT_LLM_SETTINGS[name])
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit breaker is open"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """The call's overall deadline passed before a response arrived"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold failed calls the circuit opens and every call is
+    refused for reset_timeout seconds. Then a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go upstream now"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def is_open(self):
+        """Whether calls are currently being refused, without consuming a trial"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"LLM circuit breaker opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'rejected_calls': self.rejected,
+            }
+
+
+class LLMClient:
+    """
+    Chat completion client with deadlines, retries, hedging and a breaker.
+
+    Every call gets an overall deadline. Attempts that fail with a retryable
+    error are retried with jittered exponential backoff while time remains.
+    With HEDGE_DELAY set, a second identical request is sent if the first has
+    not answered by then, and whichever finishes first wins. HTTP connections
+    come from a bounded keep-alive pool shared by all threads.
+    """
+
+    def __init__(self, api_key, base_url, deadline, timeout, connect_timeout, max_retries,
+                 retry_backoff, hedge_delay, pool_size, keepalive_expiry, breaker):
+        self.configured = bool(api_key or base_url)
+        self.deadline = deadline
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.hedge_delay = hedge_delay
+        self.breaker = breaker
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+        self._openai = OpenAI(
+            api_key=api_key or 'not-configured',
+            base_url=base_url or None,
+            http_client=self._http,
+            max_retries=0,
+            timeout=timeout,
+        )
+        self._hedge_pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='llm-hedge')
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            api_key=getattr(settings, 'OPENAI_API_KEY', None),
+            base_url=llm_setting('BASE_URL'),
+            deadline=llm_setting('DEADLINE'),
+            timeout=llm_setting('TIMEOUT'),
+            connect_timeout=llm_setting('CONNECT_TIMEOUT'),
+            max_retries=llm_setting('MAX_RETRIES'),
+            retry_backoff=llm_setting('RETRY_BACKOFF'),
+            hedge_delay=llm_setting('HEDGE_DELAY'),
+            pool_size=llm_setting('POOL_SIZE'),
+            keepalive_expiry=llm_setting('KEEPALIVE_EXPIRY'),
+            breaker=CircuitBreaker(
+                failure_threshold=llm_setting('BREAKER_FAILURE_THRESHOLD'),
+                reset_timeout=llm_setting('BREAKER_RESET_TIMEOUT'),
+            ),
+        )
+
+    def is_available(self):
+        """Whether calls can be made: configured and the circuit is not open"""
+        return self.configured and not self.breaker.is_open()
+
+    def create(self, deadline=None, **kwargs):
+        """Non-streaming chat completion; raises on failure so callers can fall back"""
+        return self._call(self._complete, deadline, kwargs)
+
+    def stream(self, deadline=None, **kwargs):
+        """
+        Streaming chat completion, yielding chunks.
+
+        Retries only cover opening the stream; once chunks have been yielded a
+        failure is raised to the caller.
+        """
+        stream = self._call(self._open_stream, deadline, kwargs)
+        try:
+            yield from stream
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            stream.close()
+
+    def _call(self, send, deadline, kwargs):
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = send(kwargs, min(remaining, self.timeout))
+            except RETRYABLE_ERRORS as e:
+                last_error = e
+                logger.warning(f"LLM attempt {attempt + 1} failed: {e}")
+                if attempt == self.max_retries:
+                    break
+                backoff = self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                time.sleep(max(0, min(backoff, deadline_at - time.monotonic())))
+                continue
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            return result
+
+        self.breaker.record_failure()
+        raise last_error or DeadlineExceededError("LLM call deadline exceeded")
+
+    def _complete(self, kwargs, timeout):
+        if not self.hedge_delay or self.hedge_delay >= timeout:
+            return self._send(kwargs, timeout)
+
+        started = time.monotonic()
+        primary = self._hedge_pool.submit(self._send, kwargs, timeout)
+        done, _ = wait([primary], timeout=self.hedge_delay)
+        if done:
+            return primary.result()
+
+        logger.info(f"LLM call slower than {self.hedge_delay}s, sending hedged request")
+        remaining = timeout - (time.monotonic() - started)
+        hedge = self._hedge_pool.submit(self._send, kwargs, remaining)
+        pending = {primary, hedge}
+        error = None
+
+        while pending:
+            done, pending = wait(pending, timeout=max(0, timeout - (time.monotonic() - started)), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+
+        raise error or DeadlineExceededError("LLM call deadline exceeded")
+
+    def _send(self, kwargs, timeout):
+        return self._openai.with_options(timeout=timeout).chat.completions.create(**kwargs)
+
+    def _open_stream(self, kwargs, timeout):
+        return self._openai.with_options(timeout=timeout).chat.completions.create(stream=True, **kwargs)
+
+    def stats(self):
+        return {
+            'configured': self.configured,
+            'breaker': self.breaker.stats(),
+        }
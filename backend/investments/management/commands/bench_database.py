@@ -0,0 +1,104 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from auth.db import is_memory_database
+from investments.models import Investment
+from investments.pagination import invalidate_investment_counts
+
+BENCH_PREFIX = 'Bench Database'
+
+TYPES = [choice for choice, _ in Investment.INVESTMENT_TYPES]
+
+
+def run_worker(ids, seconds, write_ratio, seed):
+    """Mixed reads and single-row writes for a fixed time; returns (reads, writes, errors)"""
+    # Forked workers must not share the parent's connection
+    connections.close_all()
+    rng = random.Random(seed)
+    reads = writes = errors = 0
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                Investment.objects.filter(id=rng.choice(ids)).update(
+                    minimum_amount=Decimal(rng.randint(1000, 100000))
+                )
+                writes += 1
+            else:
+                Investment.objects.get(id=rng.choice(ids))
+                list(
+                    Investment.objects.filter(is_active=True, type=rng.choice(TYPES))
+                    .order_by('type', 'name', 'id').values_list('id', 'name')[:50]
+                )
+                reads += 1
+        except OperationalError:
+            # "database is locked" once busy_timeout runs out
+            errors += 1
+
+    connections.close_all()
+    return reads, writes, errors
+
+
+class Command(BaseCommand):
+    help = "Measure read and write throughput of the configured database with concurrent worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4', help="Comma-separated worker process counts to compare")
+        parser.add_argument('--seconds', type=float, default=3.0, help="Duration of each run")
+        parser.add_argument('--rows', type=int, default=2000, help="Investments created for the benchmark")
+        parser.add_argument('--write-ratio', type=float, default=0.1, help="Share of operations that write")
+
+    def handle(self, *args, **options):
+        database = connections[DEFAULT_DB_ALIAS].settings_dict
+        if is_memory_database(database):
+            raise CommandError(
+                "The database is in memory, so each worker process would get its own; set DATABASE_URL"
+            )
+        try:
+            worker_counts = [int(count) for count in options['workers'].split(',')]
+        except ValueError:
+            raise CommandError("--workers must be comma-separated integers")
+        if min(worker_counts) < 1 or options['rows'] < 1 or not 0 <= options['write_ratio'] <= 1:
+            raise CommandError("--workers and --rows must be positive and --write-ratio between 0 and 1")
+
+        self.stdout.write(f"{database['ENGINE'].rsplit('.', 1)[-1]} {database['NAME']}")
+        ids = self.create_rows(options['rows'])
+        try:
+            self.stdout.write(f"{'workers':>7} {'ops/s':>10} {'reads/s':>10} {'writes/s':>10} {'errors':>7}")
+            for count in worker_counts:
+                self.run(ids, count, options['seconds'], options['write_ratio'])
+        finally:
+            Investment.objects.filter(name__startswith=BENCH_PREFIX).delete()
+            invalidate_investment_counts()
+
+    def create_rows(self, rows):
+        Investment.objects.filter(name__startswith=BENCH_PREFIX).delete()
+        Investment.objects.bulk_create(
+            Investment(
+                name=f"{BENCH_PREFIX} {index}", canonical_name=f"{BENCH_PREFIX.lower()} {index}",
+                type=TYPES[index % len(TYPES)], minimum_amount=Decimal(1000 + index),
+                expected_return=Decimal('9.75'), risk_level='moderate',
+                description='Benchmark investment', local_description='Uwekezaji wa majaribio'
+            )
+            for index in range(rows)
+        )
+        return list(Investment.objects.filter(name__startswith=BENCH_PREFIX).values_list('id', flat=True))
+
+    def run(self, ids, workers, seconds, write_ratio):
+        # Close before forking so no worker inherits an open connection
+        connections.close_all()
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_worker, ids, seconds, write_ratio, seed) for seed in range(workers)]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+        reads, writes, errors = (sum(values) for values in zip(*results))
+        self.stdout.write(
+            f"{workers:>7} {(reads + writes) / elapsed:>10,.0f} {reads / elapsed:>10,.0f} "
+            f"{writes / elapsed:>10,.0f} {errors:>7}"
+        )
@@ -0,0 +1,70 @@
+import time
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from investments.models import RiskProfile
+from investments.persistence import replace_recommendations
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark's rows"""
+
+
+def synthetic_recommendations(count, prefix):
+    return [
+        {
+            'name': f"{prefix} Fund {index}",
+            'type': 'mutual_funds',
+            'minimum_amount': Decimal('1000'),
+            'expected_return': Decimal('10.5'),
+            'risk_level': 'moderate',
+            'description': 'Benchmark investment',
+            'local_description': 'Uwekezaji wa majaribio',
+            'recommended_amount': Decimal('1000'),
+            'rationale': 'Benchmark recommendation',
+            'confidence_score': 0.8,
+        }
+        for index in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Show that saving a recommendation set costs a constant number of queries as the set grows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1, 5, 20, 100, 500])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'items':>8} {'new catalog':>12} {'queries':>8} {'ms':>10}")
+        for size in options['sizes']:
+            for label, reuse in (('yes', False), ('no', True)):
+                queries, elapsed = self.measure(size, reuse)
+                self.stdout.write(f"{size:>8} {label:>12} {queries:>8} {elapsed:>10.2f}")
+
+    def measure(self, size, reuse_catalog):
+        """Queries and time to replace a profile's recommendations; all rows are rolled back"""
+        result = {}
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(
+                    email='bench@example.com', username='bench', full_name='Bench', password=None
+                )
+                profile = RiskProfile.objects.create(
+                    user=user, age=30, monthly_income=Decimal('100000'), investment_amount=Decimal('1000000'),
+                    risk_tolerance='moderate', investment_timeline=36, financial_goals='Benchmark'
+                )
+                recommendations = synthetic_recommendations(size, 'Bench')
+                if reuse_catalog:
+                    replace_recommendations(profile, recommendations)
+
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    replace_recommendations(profile, recommendations)
+                    result['elapsed'] = (time.perf_counter() - started) * 1000
+                result['queries'] = len(captured)
+                raise Rollback
+        except Rollback:
+            pass
+        return result['queries'], result['elapsed']
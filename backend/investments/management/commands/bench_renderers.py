@@ -0,0 +1,100 @@
+import gzip
+import time
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from auth.renderers import MessagePackRenderer, ORJSONRenderer
+from investments.engine import local_engine
+from investments.models import Investment, RiskProfile
+from investments.persistence import save_recommendations
+from investments.serializers import InvestmentRecommendationSerializer, RiskProfileSerializer
+from investments.summaries import investment_summary_rows
+
+RENDERERS = [
+    ('drf json', JSONRenderer()),
+    ('orjson', ORJSONRenderer()),
+    ('msgpack', MessagePackRenderer()),
+]
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark's rows"""
+
+
+class Command(BaseCommand):
+    help = "Compare render time and size of the JSON, orjson and MessagePack renderers on real payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=50, help="Profiles in the recommendations payload")
+        parser.add_argument('--listing-size', type=int, default=1000, help="Rows in the investments listing payload")
+        parser.add_argument('--repeat', type=int, default=20, help="Best of this many renders")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                payloads = self.build_payloads(options['profiles'], options['listing_size'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(f"{'payload':<16} {'renderer':<10} {'ms':>9} {'bytes':>10} {'gzip':>9}")
+        for label, payload in payloads:
+            baseline = None
+            for name, renderer in RENDERERS:
+                body, elapsed = self.measure(renderer, payload, options['repeat'])
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"{label:<16} {name:<10} {elapsed:>9.3f} {len(body):>10} {len(gzip.compress(body)):>9}"
+                    + (f"  {baseline / elapsed:.1f}x" if name != RENDERERS[0][0] else "")
+                )
+
+        for label, payload in payloads:
+            if JSONRenderer().render(payload) != ORJSONRenderer().render(payload):
+                self.stderr.write(f"orjson output differs from the stock renderer for {label}")
+
+    def build_payloads(self, profile_count, listing_size):
+        """Recommendation responses from the local engine and an investments listing page"""
+        User = get_user_model()
+        responses = []
+        for index in range(profile_count):
+            user = User.objects.create_user(
+                email=f'bench{index}@example.com', username=f'bench{index}', full_name='Bench', password=None
+            )
+            profile = RiskProfile.objects.create(
+                user=user, age=25 + index % 40, monthly_income=Decimal(40000 + index * 1000),
+                investment_amount=Decimal(100000 + index * 5000),
+                risk_tolerance=['conservative', 'moderate', 'aggressive'][index % 3],
+                investment_timeline=12 + index % 48, financial_goals='Education and a home'
+            )
+            saved = save_recommendations(profile, local_engine.recommend(profile))
+            responses.append({
+                'profile': RiskProfileSerializer(profile).data,
+                'recommendations': InvestmentRecommendationSerializer(saved, many=True).data,
+                'message': f'Successfully created {len(saved)} recommendations'
+            })
+
+        Investment.objects.bulk_create(
+            Investment(
+                name=f"Bench Listing {index}", canonical_name=f"bench listing {index}", type='bonds',
+                minimum_amount=Decimal(1000 + index), expected_return=Decimal('9.75'), risk_level='moderate',
+                description='Benchmark investment', local_description='Uwekezaji wa majaribio'
+            )
+            for index in range(listing_size)
+        )
+        listing = {
+            'investments': investment_summary_rows(Investment.objects.filter(is_active=True)),
+            'total_count': listing_size,
+            'next_cursor': None
+        }
+        return [('recommendations', responses), ('listing', listing)]
+
+    def measure(self, renderer, payload, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = renderer.render(payload)
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return body, best
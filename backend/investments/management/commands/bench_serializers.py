@@ -0,0 +1,71 @@
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from investments.models import Investment
+from investments.serializers import InvestmentSummarySerializer
+from investments.summaries import investment_summary_rows
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark's rows"""
+
+
+TYPES = [choice for choice, _ in Investment.INVESTMENT_TYPES]
+RISKS = ['conservative', 'moderate', 'aggressive']
+
+
+class Command(BaseCommand):
+    help = "Compare the DRF serializer and values() read paths for the investments listing"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3, help="Best of this many runs per path")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rows':>8} {'drf ms':>10} {'values ms':>10} {'speedup':>8}")
+        for size in options['sizes']:
+            drf, fast = self.measure(size, options['repeat'])
+            self.stdout.write(f"{size:>8} {drf:>10.1f} {fast:>10.1f} {drf / fast:>7.1f}x")
+
+    def measure(self, size, repeat):
+        """Best-of-repeat milliseconds for each path over size rows; all rows are rolled back"""
+        result = {}
+        try:
+            with transaction.atomic():
+                Investment.objects.bulk_create(
+                    (
+                        Investment(
+                            name=f"Bench Investment {index}",
+                            canonical_name=f"bench investment {index}",
+                            type=TYPES[index % len(TYPES)],
+                            minimum_amount=Decimal(1000 + index % 5000),
+                            expected_return=Decimal('8.5'),
+                            risk_level=RISKS[index % len(RISKS)],
+                            description='Benchmark investment',
+                            local_description='Uwekezaji wa majaribio',
+                        )
+                        for index in range(size)
+                    ),
+                    batch_size=1000,
+                )
+                queryset = Investment.objects.filter(is_active=True)
+
+                drf = self.best(repeat, lambda: InvestmentSummarySerializer(queryset.all(), many=True).data)
+                fast = self.best(repeat, lambda: investment_summary_rows(queryset.all()))
+                if InvestmentSummarySerializer(queryset.all(), many=True).data != investment_summary_rows(queryset.all()):
+                    self.stderr.write(f"Output mismatch at {size} rows")
+
+                result['times'] = drf, fast
+                raise Rollback
+        except Rollback:
+            pass
+        return result['times']
+
+    def best(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return min(timings)
@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from investments.models import InvestmentRecommendation
+from investments.retention import compact_recommendations, retention_setting
+
+
+class Command(BaseCommand):
+    help = (
+        "Move deactivated InvestmentRecommendation rows to RecommendationHistory in batches; "
+        "run it periodically, e.g. from cron, or with --interval"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="Rows moved per transaction")
+        parser.add_argument(
+            '--min-age', type=int, default=None,
+            help="Only move rows deactivated at least this many seconds ago"
+        )
+        parser.add_argument('--max-batches', type=int, default=None, help="Stop after this many batches")
+        parser.add_argument('--interval', type=float, default=None, help="Keep compacting every this many seconds")
+        parser.add_argument('--dry-run', action='store_true', help="Count the rows that would move")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or retention_setting('BATCH_SIZE')
+        min_age = retention_setting('MIN_AGE') if options['min_age'] is None else options['min_age']
+        if batch_size < 1 or min_age < 0:
+            raise CommandError("--batch-size must be positive and --min-age not negative")
+
+        if options['dry_run']:
+            pending = InvestmentRecommendation.objects.filter(
+                is_active=False, updated_at__lt=timezone.now() - timedelta(seconds=min_age)
+            ).count()
+            self.stdout.write(f"{pending} deactivated recommendations would move to history")
+            return
+
+        while True:
+            started = time.perf_counter()
+            moved = compact_recommendations(batch_size, min_age, options['max_batches'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Moved {moved} deactivated recommendations to history in {elapsed:.2f}s"
+                + (f" ({moved / elapsed:,.0f} rows/s)" if moved and elapsed > 0 else "")
+            )
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,169 @@
+import csv
+import json
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import serializers
+from investments.catalog import investment_catalog
+from investments.engine import local_engine
+from investments.models import Investment, canonical_investment_name
+from investments.pagination import invalidate_investment_counts
+from investments.serializers import InvestmentSerializer
+from investments.snapshots import discard_profile_snapshots
+
+# Columns read on import and written on export
+CATALOG_FIELDS = [
+    'name', 'type', 'minimum_amount', 'expected_return', 'risk_level',
+    'description', 'local_description', 'is_active'
+]
+
+# Invalid rows reported individually before only being counted
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = "Stream the Investment catalog in or out as CSV or JSONL, upserting imports on the canonical name"
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['import', 'export'])
+        parser.add_argument('path', help="File to read or write, or - for stdin/stdout")
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'], default=None,
+            help="Defaults to the file extension, or csv for -"
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows upserted per transaction")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows fetched per query on export")
+        parser.add_argument('--dry-run', action='store_true', help="Validate an import without writing")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.ndjson')) else 'csv')
+        if options['batch_size'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--batch-size and --chunk-size must be positive")
+
+        started = time.perf_counter()
+        if options['action'] == 'import':
+            summary = self.import_catalog(options['path'], fmt, options['batch_size'], options['dry_run'])
+        else:
+            summary = self.export_catalog(options['path'], fmt, options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        rows = summary['rows']
+        rate = rows / elapsed if elapsed > 0 else 0
+        details = ', '.join(f"{value} {key}" for key, value in summary.items() if key != 'rows')
+        self.stderr.write(
+            f"{options['action'].capitalize()}ed {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+            + (f": {details}" if details else "")
+        )
+
+    @contextmanager
+    def open_path(self, path, mode):
+        if path == '-':
+            yield sys.stdin if mode == 'r' else sys.stdout
+            return
+        with open(path, mode, encoding='utf-8', newline='') as stream:
+            yield stream
+
+    def read_rows(self, stream, fmt):
+        """Yield (line number, row dict) without holding more than one row"""
+        if fmt == 'csv':
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, f"Invalid JSON: {e}"
+
+    def import_catalog(self, path, fmt, batch_size, dry_run):
+        # One serializer, reused for every row, so fields are built once
+        validator = InvestmentSerializer()
+        summary = {'rows': 0, 'upserted': 0, 'invalid': 0}
+        batch = {}
+
+        with self.open_path(path, 'r') as stream:
+            for line_number, row in self.read_rows(stream, fmt):
+                summary['rows'] += 1
+                try:
+                    if not isinstance(row, dict):
+                        raise serializers.ValidationError(row if isinstance(row, str) else "Expected an object")
+                    data = validator.run_validation({
+                        field: row[field] for field in CATALOG_FIELDS if row.get(field) not in (None, '')
+                    })
+                except serializers.ValidationError as e:
+                    summary['invalid'] += 1
+                    if summary['invalid'] <= MAX_REPORTED_ERRORS:
+                        self.stderr.write(f"Line {line_number}: {e.detail}")
+                    continue
+
+                investment = Investment(**data, canonical_name=canonical_investment_name(data['name']))
+                # Later rows for the same product win, as a second upsert would.
+                # Only the columns the row supplied are written over an existing product.
+                batch[investment.canonical_name] = (investment, frozenset(data))
+                if len(batch) >= batch_size:
+                    summary['upserted'] += self.upsert(batch, dry_run)
+                    batch = {}
+
+        if batch:
+            summary['upserted'] += self.upsert(batch, dry_run)
+
+        if summary['upserted'] and not dry_run:
+            # Bulk upserts send no signals, and these calls only reach this
+            # process and the shared cache. Web and worker processes still see
+            # the import: the catalog's cached ids are confirmed against the
+            # database on every use, the local engine's matrix reloads within
+            # LOCAL_RECOMMENDATION_ENGINE's CATALOG_TTL, and listing counts in a
+            # per-process cache expire within INVESTMENT_LISTING's COUNT_CACHE_TTL.
+            investment_catalog.invalidate()
+            local_engine.invalidate()
+            invalidate_investment_counts()
+        return summary
+
+    def upsert(self, batch, dry_run):
+        if dry_run:
+            return len(batch)
+
+        # Rows missing an optional column, such as a file without is_active,
+        # would otherwise overwrite it with the model default
+        by_fields = defaultdict(list)
+        for investment, fields in batch.values():
+            by_fields[fields].append(investment)
+
+        with transaction.atomic():
+            for fields, investments in by_fields.items():
+                Investment.objects.bulk_create(
+                    investments,
+                    update_conflicts=True,
+                    unique_fields=['canonical_name'],
+                    update_fields=[field for field in CATALOG_FIELDS if field in fields] + ['updated_at'],
+                )
+            discard_profile_snapshots(
+                user__risk_profiles__recommendations__investment__canonical_name__in=list(batch)
+            )
+        return len(batch)
+
+    def export_catalog(self, path, fmt, chunk_size):
+        summary = {'rows': 0}
+        rows = Investment.objects.order_by('id').values(*CATALOG_FIELDS).iterator(chunk_size=chunk_size)
+
+        with self.open_path(path, 'w') as stream:
+            if fmt == 'csv':
+                writer = csv.DictWriter(stream, fieldnames=CATALOG_FIELDS)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+                    summary['rows'] += 1
+            else:
+                for row in rows:
+                    row['minimum_amount'] = str(row['minimum_amount'])
+                    row['expected_return'] = str(row['expected_return'])
+                    stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+                    summary['rows'] += 1
+        return summary
@@ -0,0 +1,84 @@
+import os
+import socket
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, transaction
+from investments.jobs import claim_next_job, complete_job, fail_job, job_setting
+from investments.persistence import replace_recommendations
+from investments.views import generate_ai_recommendations
+
+
+class Command(BaseCommand):
+    help = "Drain the recommendation job queue, generating AI recommendations for queued risk profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help="Number of worker threads (defaults to RECOMMENDATION_JOBS['CONCURRENCY'])"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=None,
+            help="Seconds to sleep when the queue is empty"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Exit once the queue is empty instead of polling forever"
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency'] or job_setting('CONCURRENCY')
+        poll_interval = options['poll_interval'] or job_setting('POLL_INTERVAL')
+        worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.stdout.write(f"Starting {concurrency} recommendation worker(s) as {worker_name}")
+
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(f"{worker_name}:{index}", poll_interval, options['once']),
+                daemon=True,
+            )
+            for index in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping recommendation workers")
+
+    def work(self, worker_id, poll_interval, once):
+        """Claim and run jobs until stopped (or until the queue is empty with --once)"""
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job(worker_id)
+                if job is None:
+                    if once:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+                self.run_job(job)
+        finally:
+            connection.close()
+
+    def run_job(self, job):
+        """Generate and save recommendations for one claimed job"""
+        try:
+            # Model failures are retried with backoff; only the last attempt
+            # settles for the local engine's recommendations
+            recommendations = generate_ai_recommendations(
+                job.risk_profile,
+                fallback=job.attempts >= job.max_attempts
+            )
+            with transaction.atomic():
+                saved = replace_recommendations(job.risk_profile, recommendations)
+        except Exception as e:
+            fail_job(job, e)
+            return
+
+        if complete_job(job, [rec.id for rec in saved]):
+            self.stdout.write(f"Job {job.id}: saved {len(saved)} recommendations")
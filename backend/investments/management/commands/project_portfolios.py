@@ -0,0 +1,50 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from investments.models import RiskProfile
+from investments.montecarlo import projection_inputs, projection_setting, simulate_many
+
+
+class Command(BaseCommand):
+    help = "Run Monte Carlo projections for many risk profiles, optionally comparing a serial run with the process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=None, help="Project at most this many profiles")
+        parser.add_argument('--paths', type=int, default=None, help="Paths per projection")
+        parser.add_argument('--workers', type=int, default=None, help="Worker processes, 1 to run serially")
+        parser.add_argument('--compare', action='store_true', help="Also time a serial run of the same projections")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or projection_setting('PATHS')
+        workers = options['workers'] or projection_setting('WORKERS')
+        if paths < 1 or workers < 1:
+            raise CommandError("--paths and --workers must be positive")
+
+        profiles = RiskProfile.objects.order_by('id')
+        if options['profiles']:
+            profiles = profiles[:options['profiles']]
+
+        runs = []
+        for profile in profiles:
+            inputs = projection_inputs(profile)
+            if inputs is not None:
+                runs.append({**inputs, 'paths': paths, 'seed': profile.id})
+        if not runs:
+            self.stderr.write("No profiles with recommendations to project")
+            return
+
+        timings = [(f"{workers} workers", workers)]
+        if options['compare'] and workers > 1:
+            timings.insert(0, ("serial", 1))
+
+        baseline = None
+        for label, count in timings:
+            started = time.perf_counter()
+            results = simulate_many(runs, workers=count)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            simulated = sum(result['elapsed_ms'] for result in results) / 1000
+            self.stdout.write(
+                f"{label:<12} {len(runs)} projections x {paths} paths in {elapsed:.2f}s "
+                f"({len(runs) / elapsed:,.1f}/s, {simulated:.2f}s simulating)"
+                + (f"  {baseline / elapsed:.1f}x" if elapsed != baseline else "")
+            )
@@ -0,0 +1,142 @@
+import json
+import random
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+from investments.engine import SEED_CATALOG
+
+
+def standin_recommendations():
+    """A plausible recommendation array built from the seed catalog"""
+    products = random.sample(SEED_CATALOG, 3)
+    return [
+        {
+            'name': product['name'],
+            'type': product['type'],
+            'minimum_amount': float(product['minimum_amount']),
+            'expected_return': float(product['expected_return']),
+            'risk_level': product['risk_level'],
+            'description': product['description'],
+            'local_description': product['local_description'],
+            'recommended_amount': float(product['minimum_amount']),
+            'rationale': 'Stand-in recommendation for offline testing',
+            'confidence_score': 0.8,
+        }
+        for product in products
+    ]
+
+
+def standin_content(prompt):
+    """Answer in the shape the prompt asks for: keyed object for batches, else an array"""
+    keys = re.findall(r'Profile (p\d+):', prompt)
+    if keys:
+        return json.dumps({key: standin_recommendations() for key in keys})
+    return json.dumps(standin_recommendations())
+
+
+class Command(BaseCommand):
+    help = "Run a local stand-in for the OpenAI chat completions API (set LLM_BASE_URL=http://HOST:PORT/v1)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.5, help="Base response latency in seconds")
+        parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency, up to this many seconds")
+        parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of requests answered with --failure-status")
+        parser.add_argument('--failure-status', type=int, default=503)
+
+    def handle(self, *args, **options):
+        command = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    return self.send_json(404, {'error': {'message': 'Not found'}})
+
+                time.sleep(options['latency'] + random.uniform(0, options['jitter']))
+
+                if random.random() < options['failure_rate']:
+                    return self.send_json(options['failure_status'], {'error': {'message': 'Stand-in failure'}})
+
+                prompt = ' '.join(message.get('content', '') for message in body.get('messages', []))
+                content = standin_content(prompt)
+                model = body.get('model', 'standin')
+
+                if body.get('stream'):
+                    return self.send_stream(model, content)
+
+                prompt_tokens = len(prompt) // 4
+                completion_tokens = len(content) // 4
+                self.send_json(200, {
+                    'id': f"chatcmpl-{uuid.uuid4().hex}",
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': model,
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': 'stop',
+                    }],
+                    'usage': {
+                        'prompt_tokens': prompt_tokens,
+                        'completion_tokens': completion_tokens,
+                        'total_tokens': prompt_tokens + completion_tokens,
+                    },
+                })
+
+            def send_json(self, status_code, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_stream(self, model, content):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+                pieces = [content[i:i + 24] for i in range(0, len(content), 24)]
+                for piece in pieces + [None]:
+                    chunk = {
+                        'id': completion_id,
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': model,
+                        'choices': [{
+                            'index': 0,
+                            'delta': {'content': piece} if piece else {},
+                            'finish_reason': None if piece else 'stop',
+                        }],
+                    }
+                    self.write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                    time.sleep(0.01)
+                self.write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def write_chunk(self, text):
+                data = text.encode('utf-8')
+                self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                command.stdout.write(f"{self.address_string()} {format % args}")
+
+        server = ThreadingHTTPServer((options['host'], options['port']), Handler)
+        self.stdout.write(f"LLM stand-in listening on http://{options['host']}:{options['port']}/v1")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,47 @@
+import sqlite3
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from auth.db import ENGINES, is_memory_database
+from auth.routers import replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto its SQLite replicas with the online backup API, "
+        "standing in for replication when testing replica routing locally"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None, help="Keep syncing every this many seconds")
+        parser.add_argument('--pages', type=int, default=1024, help="Pages copied per backup step")
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS].settings_dict
+        replicas = [connections[alias].settings_dict for alias in replica_aliases()]
+        if not replicas:
+            raise CommandError("No replicas configured; set DATABASE_REPLICA_URLS")
+        for database in [primary] + replicas:
+            if database['ENGINE'] != ENGINES['sqlite'] or is_memory_database(database):
+                raise CommandError(f"Only file-backed SQLite databases can be synced: {database['NAME']}")
+
+        while True:
+            started = time.perf_counter()
+            for replica in replicas:
+                self.sync(primary['NAME'], replica['NAME'], options['pages'])
+            self.stdout.write(
+                f"Synced {len(replicas)} replica(s) in {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
+
+    def sync(self, source_path, target_path, pages):
+        # The backup API copies a consistent snapshot while the primary stays writable
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target, pages=pages)
+        finally:
+            target.close()
+            source.close()
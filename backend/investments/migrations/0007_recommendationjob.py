@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-17 20:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0006_alter_investmentrecommendation_confidence_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the job may be claimed')),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Visibility timeout of the current claim', null=True)),
+                ('locked_by', models.CharField(blank=True, max_length=100)),
+                ('last_error', models.TextField(blank=True)),
+                ('result', models.JSONField(blank=True, default=list, help_text='IDs of the saved recommendations')),
+                ('risk_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_jobs', to='investments.riskprofile')),
+            ],
+            options={
+                'verbose_name': 'Recommendation Job',
+                'verbose_name_plural': 'Recommendation Jobs',
+                'ordering': ['run_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='recjob_status_run_after_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-17 20:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0007_recommendationjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMCallRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('single', 'Single'), ('batch', 'Batch'), ('stream', 'Stream')], default='single', max_length=20)),
+                ('model', models.CharField(blank=True, max_length=100)),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('latency_ms', models.PositiveIntegerField(default=0)),
+                ('batch_size', models.PositiveIntegerField(default=1)),
+                ('outcome', models.CharField(choices=[('success', 'Success'), ('fallback', 'Fallback')], max_length=20)),
+                ('fallback_reason', models.CharField(blank=True, max_length=50)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='llm_calls', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'LLM Call Record',
+                'verbose_name_plural': 'LLM Call Records',
+                'indexes': [models.Index(fields=['created_at'], name='llmcall_created_at_idx'), models.Index(fields=['user', 'created_at'], name='llmcall_user_created_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+import re
+
+from django.db import migrations, models
+
+
+def canonical_investment_name(name):
+    # Frozen copy of investments.models.canonical_investment_name
+    return ' '.join(re.sub(r'[\W_]+', ' ', (name or '').casefold()).split())
+
+
+def populate_canonical_names(apps, schema_editor):
+    """Fill canonical_name and merge investments that normalize to the same name"""
+    Investment = apps.get_model('investments', 'Investment')
+    InvestmentRecommendation = apps.get_model('investments', 'InvestmentRecommendation')
+
+    keepers = {}
+    for investment in Investment.objects.order_by('id'):
+        key = canonical_investment_name(investment.name)
+        keeper = keepers.get(key)
+
+        if keeper is None:
+            investment.canonical_name = key
+            investment.save(update_fields=['canonical_name'])
+            keepers[key] = investment
+            continue
+
+        # Point the duplicate's recommendations at the kept row, dropping any
+        # that would collide with an existing (risk_profile, investment) pair
+        taken = set(
+            InvestmentRecommendation.objects.filter(investment=keeper).values_list('risk_profile_id', flat=True)
+        )
+        duplicates = InvestmentRecommendation.objects.filter(investment=investment)
+        duplicates.filter(risk_profile_id__in=taken).delete()
+        duplicates.update(investment=keeper)
+        investment.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0008_llmcallrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investment',
+            name='canonical_name',
+            field=models.CharField(editable=False, max_length=200, null=True),
+        ),
+        migrations.RunPython(populate_canonical_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='investment',
+            name='canonical_name',
+            field=models.CharField(editable=False, help_text='Normalized name used as the catalog lookup key', max_length=200, unique=True),
+        ),
+    ]
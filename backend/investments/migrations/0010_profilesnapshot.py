@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-17 20:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0009_investment_canonical_name'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSnapshot',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_snapshot', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('etag', models.CharField(max_length=64)),
+                ('body', models.TextField(help_text='Rendered JSON response body')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
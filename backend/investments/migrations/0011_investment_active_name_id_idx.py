@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-17 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0010_profilesnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='investment',
+            options={'ordering': ['name', 'id'], 'verbose_name': 'Investment', 'verbose_name_plural': 'Investments'},
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name', 'id'], name='investment_active_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-17 21:00
+
+from django.db import migrations, models
+from investments.search import drop_search_index, ensure_search_index
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 on SQLite; other databases use substring search
+    ensure_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0011_investment_active_name_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['type', 'name', 'id'], name='investment_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['risk_level', 'name', 'id'], name='investment_active_risk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['expected_return', 'id'], name='investment_active_return_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['minimum_amount', 'id'], name='investment_active_minimum_idx'),
+        ),
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
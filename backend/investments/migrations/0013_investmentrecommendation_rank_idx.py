@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-17 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0012_investment_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentrecommendation',
+            index=models.Index(fields=['risk_profile', '-confidence_score', '-recommended_amount'], name='recommendation_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0 on 2026-10-17 21:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0013_investmentrecommendation_rank_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recommended_amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('ai_rationale', models.TextField()),
+                ('confidence_score', models.DecimalField(decimal_places=2, max_digits=3)),
+                ('recommended_at', models.DateTimeField(help_text='When the recommendation was first made')),
+                ('deactivated_at', models.DateTimeField(help_text='When a newer recommendation set replaced it')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Recommendation History',
+                'verbose_name_plural': 'Recommendation History',
+                'ordering': ['-deactivated_at', '-id'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='investmentrecommendation',
+            name='recommendation_rank_idx',
+        ),
+        migrations.AddIndex(
+            model_name='investmentrecommendation',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['risk_profile', '-confidence_score', '-recommended_amount'], name='recommendation_active_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentrecommendation',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['updated_at', 'id'], name='recommendation_inactive_idx'),
+        ),
+        migrations.AddField(
+            model_name='recommendationhistory',
+            name='investment',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_history', to='investments.investment'),
+        ),
+        migrations.AddField(
+            model_name='recommendationhistory',
+            name='risk_profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_history', to='investments.riskprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationhistory',
+            index=models.Index(fields=['risk_profile', '-deactivated_at', '-id'], name='rec_history_profile_idx'),
+        ),
+    ]
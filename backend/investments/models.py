@@ -1,9 +1,15 @@
+import re
+from decimal import Decimal
 from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+def canonical_investment_name(name):
+    """Normalized lookup key for an investment name: casefolded, punctuation and extra spaces removed"""
+    return ' '.join(re.sub(r'[\W_]+', ' ', (name or '').casefold()).split())
+
 # Create your models here.
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -54,7 +60,7 @@ class RiskProfile(TimeStampedModel):
     def monthly_investment_capacity(self):
         """Calculate potential monthly investment capacity (rough estimate)"""
         # Simple calculation - could be more sophisticated
-        return self.monthly_income * 0.1  # Assuming 10% of income for investment
+        return self.monthly_income * Decimal('0.1')  # Assuming 10% of income for investment
 
 class Investment(TimeStampedModel):
     INVESTMENT_TYPES = [
@@ -70,6 +76,12 @@ class Investment(TimeStampedModel):
     ]
 
     name = models.CharField(max_length=200)
+    canonical_name = models.CharField(
+        max_length=200,
+        unique=True,
+        editable=False,
+        help_text="Normalized name used as the catalog lookup key"
+    )
     type = models.CharField(max_length=50, choices=INVESTMENT_TYPES)
     minimum_amount = models.DecimalField(
         max_digits=10, 
@@ -90,16 +102,79 @@ class Investment(TimeStampedModel):
     class Meta:
         verbose_name = "Investment"
         verbose_name_plural = "Investments"
-        ordering = ['name']
+        ordering = ['name', 'id']
+        indexes = [
+            # Keyset pagination of the active catalog seeks on (name, id)
+            models.Index(
+                fields=['name', 'id'],
+                condition=models.Q(is_active=True),
+                name='investment_active_name_id_idx'
+            ),
+            # Filtered listings: partial on active rows, each ending in a sort key and id
+            models.Index(
+                fields=['type', 'name', 'id'],
+                condition=models.Q(is_active=True),
+                name='investment_active_type_idx'
+            ),
+            models.Index(
+                fields=['risk_level', 'name', 'id'],
+                condition=models.Q(is_active=True),
+                name='investment_active_risk_idx'
+            ),
+            models.Index(
+                fields=['expected_return', 'id'],
+                condition=models.Q(is_active=True),
+                name='investment_active_return_idx'
+            ),
+            models.Index(
+                fields=['minimum_amount', 'id'],
+                condition=models.Q(is_active=True),
+                name='investment_active_minimum_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_type_display()})"
     
+    def save(self, *args, **kwargs):
+        self.canonical_name = canonical_investment_name(self.name)
+        super().save(*args, **kwargs)
+    
     @property
     def expected_return_decimal(self):
         """Return expected return as decimal for calculations"""
         return self.expected_return / 100
 
+# Precision of portfolio metrics computed in SQL
+METRIC_FIELD = models.DecimalField(max_digits=30, decimal_places=10)
+
+class InvestmentRecommendationQuerySet(models.QuerySet):
+    def with_portfolio_metrics(self):
+        """
+        Annotate portfolio_percentage and projected_return, computed in SQL.
+        
+        The values match the percentage_of_portfolio and projected_annual_return
+        properties, which use them when present, and can be filtered, ordered
+        and aggregated.
+        """
+        return self.annotate(
+            portfolio_percentage=models.Case(
+                models.When(
+                    risk_profile__investment_amount__gt=0,
+                    then=models.ExpressionWrapper(
+                        models.F('recommended_amount') * 100 / models.F('risk_profile__investment_amount'),
+                        output_field=METRIC_FIELD
+                    )
+                ),
+                default=models.Value(Decimal('0')),
+                output_field=METRIC_FIELD
+            ),
+            projected_return=models.ExpressionWrapper(
+                models.F('recommended_amount') * models.F('investment__expected_return') / 100,
+                output_field=METRIC_FIELD
+            ),
+        )
+
 class InvestmentRecommendation(TimeStampedModel):
     risk_profile = models.ForeignKey(RiskProfile, on_delete=models.CASCADE, related_name='recommendations')
     investment = models.ForeignKey(Investment, on_delete=models.CASCADE, related_name='recommendations')
@@ -121,11 +196,28 @@ class InvestmentRecommendation(TimeStampedModel):
     )
     is_active = models.BooleanField(default=True)
     
+    objects = InvestmentRecommendationQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Investment Recommendation"
         verbose_name_plural = "Investment Recommendations"
         unique_together = ['risk_profile', 'investment']
         ordering = ['-confidence_score', '-recommended_amount']
+        indexes = [
+            # A profile's active recommendations come back in Meta.ordering without
+            # a sort step; partial, so deactivated rows awaiting compaction stay out
+            models.Index(
+                fields=['risk_profile', '-confidence_score', '-recommended_amount'],
+                condition=models.Q(is_active=True),
+                name='recommendation_active_rank_idx'
+            ),
+            # compact_recommendations walks only the deactivated rows, oldest first
+            models.Index(
+                fields=['updated_at', 'id'],
+                condition=models.Q(is_active=False),
+                name='recommendation_inactive_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"Recommendation for {self.risk_profile.user.username} - {self.investment.name}"
@@ -133,6 +225,8 @@ class InvestmentRecommendation(TimeStampedModel):
     @property
     def percentage_of_portfolio(self):
         """Calculate what percentage of total investment this recommendation represents"""
+        if 'portfolio_percentage' in self.__dict__:
+            return self.portfolio_percentage
         if self.risk_profile.investment_amount > 0:
             return (self.recommended_amount / self.risk_profile.investment_amount) * 100
         return 0
@@ -140,4 +234,128 @@ class InvestmentRecommendation(TimeStampedModel):
     @property
     def projected_annual_return(self):
         """Calculate projected annual return amount"""
+        if 'projected_return' in self.__dict__:
+            return self.projected_return
         return self.recommended_amount * self.investment.expected_return_decimal
+
+class RecommendationHistory(models.Model):
+    """A deactivated recommendation, moved out of InvestmentRecommendation by `manage.py compact_recommendations`"""
+    risk_profile = models.ForeignKey(RiskProfile, on_delete=models.CASCADE, related_name='recommendation_history')
+    investment = models.ForeignKey(Investment, on_delete=models.CASCADE, related_name='recommendation_history')
+    recommended_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    ai_rationale = models.TextField()
+    confidence_score = models.DecimalField(max_digits=3, decimal_places=2)
+    recommended_at = models.DateTimeField(help_text="When the recommendation was first made")
+    deactivated_at = models.DateTimeField(help_text="When a newer recommendation set replaced it")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Recommendation History"
+        verbose_name_plural = "Recommendation History"
+        ordering = ['-deactivated_at', '-id']
+        indexes = [
+            models.Index(fields=['risk_profile', '-deactivated_at', '-id'], name='rec_history_profile_idx'),
+        ]
+
+    def __str__(self):
+        return f"Past recommendation {self.investment_id} for profile {self.risk_profile_id}"
+
+class RecommendationJob(TimeStampedModel):
+    """Queued AI recommendation generation for a risk profile"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUSES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    risk_profile = models.ForeignKey(RiskProfile, on_delete=models.CASCADE, related_name='recommendation_jobs')
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Earliest time the job may be claimed")
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="Visibility timeout of the current claim")
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    result = models.JSONField(default=list, blank=True, help_text="IDs of the saved recommendations")
+
+    class Meta:
+        verbose_name = "Recommendation Job"
+        verbose_name_plural = "Recommendation Jobs"
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='recjob_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} for {self.risk_profile_id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+class LLMCallRecord(TimeStampedModel):
+    """Token, latency and outcome accounting for one recommendation model call"""
+    OUTCOME_SUCCESS = 'success'
+    OUTCOME_FALLBACK = 'fallback'
+    OUTCOMES = [
+        (OUTCOME_SUCCESS, 'Success'),
+        (OUTCOME_FALLBACK, 'Fallback'),
+    ]
+
+    REASON_NOT_CONFIGURED = 'not_configured'
+    REASON_CIRCUIT_OPEN = 'circuit_open'
+    REASON_TIMEOUT = 'timeout'
+    REASON_API_ERROR = 'api_error'
+    REASON_PARSE_ERROR = 'parse_error'
+    REASON_NO_RECOMMENDATIONS = 'no_valid_recommendations'
+
+    KINDS = [
+        ('single', 'Single'),
+        ('batch', 'Batch'),
+        ('stream', 'Stream'),
+    ]
+
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='llm_calls'
+    )
+    kind = models.CharField(max_length=20, choices=KINDS, default='single')
+    model = models.CharField(max_length=100, blank=True)
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    latency_ms = models.PositiveIntegerField(default=0)
+    batch_size = models.PositiveIntegerField(default=1)
+    outcome = models.CharField(max_length=20, choices=OUTCOMES)
+    fallback_reason = models.CharField(max_length=50, blank=True)
+
+    class Meta:
+        verbose_name = "LLM Call Record"
+        verbose_name_plural = "LLM Call Records"
+        indexes = [
+            models.Index(fields=['created_at'], name='llmcall_created_at_idx'),
+            models.Index(fields=['user', 'created_at'], name='llmcall_user_created_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.kind} call ({self.outcome}, {self.latency_ms} ms)"
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+class ProfileSnapshot(models.Model):
+    """Denormalized GET /risk-profile/me/ response body, rebuilt when the profile or its recommendations change"""
+    user = models.OneToOneField(
+        to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='profile_snapshot'
+    )
+    version = models.PositiveIntegerField(default=1)
+    etag = models.CharField(max_length=64)
+    body = models.TextField(help_text="Rendered JSON response body")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Profile snapshot for {self.user_id} (v{self.version})"
@@ -0,0 +1,129 @@
+import base64
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_LISTING_SETTINGS = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 200,
+    'COUNT_CACHE_TTL': 300,
+}
+
+# Bumped whenever the catalog changes, which orphans every cached count at once
+COUNT_GENERATION_KEY = 'investments:count_generation'
+
+# Sort option -> (field, descending); id breaks ties in the same direction
+SORTS = {
+    'name': ('name', False),
+    'expected_return': ('expected_return', False),
+    '-expected_return': ('expected_return', True),
+    'minimum_amount': ('minimum_amount', False),
+    '-minimum_amount': ('minimum_amount', True),
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not produced by encode_cursor"""
+
+
+def listing_setting(name):
+    """Read an INVESTMENT_LISTING setting, falling back to the defaults"""
+    return getattr(settings, 'INVESTMENT_LISTING', {}).get(name, DEFAULT_LISTING_SETTINGS[name])
+
+
+def encode_cursor(sort, value, investment_id):
+    """Opaque cursor for the position after (value, id) in the given sort"""
+    raw = json.dumps([sort, str(value), investment_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _load_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, value, investment_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e))
+    return cursor_sort, value, investment_id
+
+
+def cursor_sort(cursor):
+    """The sort order a cursor was encoded for"""
+    return _load_cursor(cursor)[0]
+
+
+def decode_cursor(cursor, sort):
+    cursor_sort, value, investment_id = _load_cursor(cursor)
+    if cursor_sort != sort:
+        raise InvalidCursor('Cursor belongs to a different sort order')
+    if not isinstance(value, str) or not isinstance(investment_id, int):
+        raise InvalidCursor('Malformed cursor position')
+    return value, investment_id
+
+
+def page_size_param(value):
+    """Requested page size clamped to 1..MAX_PAGE_SIZE, or the default"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return listing_setting('PAGE_SIZE')
+    return max(1, min(size, listing_setting('MAX_PAGE_SIZE')))
+
+
+def keyset_page(queryset, cursor, page_size, sort='name'):
+    """
+    One page of queryset in the given sort order, seeking past cursor.
+
+    The seek condition matches the (field, id) indexes, so every page costs
+    the same however deep the client pages. Returns the page queryset and the
+    cursor for the next page, or None on the last page.
+    """
+    field, descending = SORTS[sort]
+    if descending:
+        queryset = queryset.order_by(f'-{field}', '-id')
+    else:
+        queryset = queryset.order_by(field, 'id')
+
+    if cursor:
+        value, investment_id = decode_cursor(cursor, sort)
+        try:
+            value = queryset.model._meta.get_field(field).to_python(value)
+        except ValidationError:
+            raise InvalidCursor('Malformed cursor position')
+        after = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{field}__{after}': value}) | Q(**{field: value, f'id__{after}': investment_id})
+        )
+
+    # Fetch one extra key to learn whether another page follows
+    keys = list(queryset.values_list(field, 'id')[:page_size + 1])
+    next_cursor = encode_cursor(sort, *keys[page_size - 1]) if len(keys) > page_size else None
+    return queryset.filter(id__in=[investment_id for _, investment_id in keys[:page_size]]), next_cursor
+
+
+def investment_count(queryset, filters_key=''):
+    """
+    Row count for a listing query, cached per filter combination.
+
+    Counts are informational, so they are served from the cache until the
+    catalog changes or the TTL passes.
+    """
+    generation = cache.get_or_set(COUNT_GENERATION_KEY, 0, None)
+    digest = hashlib.sha1(filters_key.encode('utf-8')).hexdigest()
+    key = f'investments:count:{generation}:{digest}'
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, listing_setting('COUNT_CACHE_TTL'))
+    return count
+
+
+def invalidate_investment_counts():
+    try:
+        cache.incr(COUNT_GENERATION_KEY)
+    except ValueError:
+        # Nothing has been counted yet
+        pass
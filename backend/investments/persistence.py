@@ -0,0 +1,153 @@
+import logging
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .catalog import investment_catalog
+from .engine import local_engine
+from .models import Investment, InvestmentRecommendation, canonical_investment_name
+from .pagination import invalidate_investment_counts
+from .snapshots import rebuild_profile_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Largest values the DecimalField definitions can store
+MAX_AMOUNT = Decimal('99999999.99')
+MAX_RETURN = Decimal('100')
+
+RECOMMENDATION_UPDATE_FIELDS = ['recommended_amount', 'ai_rationale', 'confidence_score', 'is_active', 'updated_at']
+
+
+def _is_storable(rec):
+    """Whether a generated recommendation fits the model's field constraints"""
+    try:
+        return (
+            bool(canonical_investment_name(rec['name']))
+            and Decimal('0') <= rec['minimum_amount'] <= MAX_AMOUNT
+            and Decimal('0') <= rec['expected_return'] <= MAX_RETURN
+            and Decimal('0') <= rec['recommended_amount'] <= MAX_AMOUNT
+        )
+    except (KeyError, TypeError):
+        return False
+
+
+@transaction.atomic(savepoint=False)
+def save_recommendations(profile, recommendations):
+    """
+    Persist a generated recommendation set for a profile in a constant number of queries.
+
+    Investment names are resolved by canonical name in one query that also
+    confirms the in-process catalog's cached ids, missing catalog rows are
+    bulk-inserted, and recommendations are bulk-upserted against the
+    (risk_profile, investment) unique constraint, reactivating any earlier row
+    for the same investment. Returns the saved recommendations in input order.
+    """
+    saved = _upsert_recommendations(profile, recommendations)
+    # Bulk writes send no signals, so refresh the profile's read model once
+    # the writes above commit
+    transaction.on_commit(lambda: rebuild_profile_snapshot(profile))
+    return saved
+
+
+def _upsert_recommendations(profile, recommendations):
+    by_name, seen = {}, set()
+    for rec in recommendations:
+        if not _is_storable(rec):
+            logger.error(f"Error creating recommendation: invalid values for {rec.get('name')!r}")
+            continue
+        # The same product twice in one set would violate the unique constraint
+        key = canonical_investment_name(rec['name'])
+        if key in seen:
+            continue
+        seen.add(key)
+        by_name[rec['name']] = rec
+
+    if not by_name:
+        return []
+
+    keys = {name: canonical_investment_name(name) for name in by_name}
+    cached = investment_catalog.lookup(by_name)
+    # Another process may have deleted or renamed a cached row, so confirm the
+    # cached ids and resolve the uncached names in one query
+    found = {
+        investment.canonical_name: investment
+        for investment in Investment.objects.filter(
+            Q(pk__in=cached.values()) | Q(canonical_name__in=[keys[name] for name in by_name if name not in cached])
+        ).order_by()
+    }
+    for name, investment_id in cached.items():
+        investment = found.get(keys[name])
+        if investment is None or investment.id != investment_id:
+            investment_catalog.discard(Investment(id=investment_id))
+    investments = {name: found[keys[name]] for name in by_name if keys[name] in found}
+    # Remember rows another process inserted since the catalog loaded
+    investment_catalog.store([investment for name, investment in investments.items() if name not in cached])
+
+    missing = {
+        keys[name]: Investment(
+            name=name,
+            canonical_name=keys[name],
+            type=rec['type'],
+            minimum_amount=rec['minimum_amount'],
+            expected_return=rec['expected_return'],
+            risk_level=rec['risk_level'],
+            description=rec['description'],
+            local_description=rec['local_description'],
+        )
+        for name, rec in by_name.items()
+        if name not in investments
+    }
+    if missing:
+        # Another request may insert the same product concurrently, so ignore
+        # conflicts on canonical_name and read the winning rows back
+        Investment.objects.bulk_create(missing.values(), ignore_conflicts=True)
+        created = list(Investment.objects.filter(canonical_name__in=list(missing)).order_by())
+        # bulk_create sends no post_save signals; only cache rows that commit
+        transaction.on_commit(lambda: investment_catalog.store(created))
+        transaction.on_commit(invalidate_investment_counts)
+        local_engine.invalidate()
+
+        by_canonical_name = {investment.canonical_name: investment for investment in created}
+        for name in by_name:
+            if name not in investments:
+                investments[name] = by_canonical_name[keys[name]]
+
+    recommendations = [
+        InvestmentRecommendation(
+            risk_profile=profile,
+            investment=investments[name],
+            recommended_amount=rec['recommended_amount'],
+            ai_rationale=rec['rationale'],
+            confidence_score=rec.get('confidence_score', 0.8),
+            is_active=True,
+        )
+        for name, rec in by_name.items()
+    ]
+    return InvestmentRecommendation.objects.bulk_create(
+        recommendations,
+        update_conflicts=True,
+        unique_fields=['risk_profile', 'investment'],
+        update_fields=RECOMMENDATION_UPDATE_FIELDS,
+    )
+
+
+def replace_recommendations(profile, recommendations):
+    """
+    Make the saved set the profile's only active recommendations.
+
+    The new set is upserted first, so investments that are recommended again
+    keep their rows; only active recommendations missing from the new set are
+    deactivated.
+    """
+    with transaction.atomic():
+        saved = save_recommendations(profile, recommendations)
+
+        InvestmentRecommendation.objects.filter(
+            risk_profile=profile,
+            is_active=True
+        ).exclude(id__in=[rec.id for rec in saved]).update(
+            # update() skips auto_now; compaction and history read the deactivation time from it
+            is_active=False, updated_at=timezone.now()
+        )
+
+    return saved
@@ -0,0 +1,62 @@
+from decimal import Decimal
+from django.db.models import Count, Q, Sum
+from .models import METRIC_FIELD, Investment, InvestmentRecommendation, RiskProfile
+from .summaries import RISK_LABELS, TYPE_LABELS, decimal_string
+
+
+def _allocation(totals, prefix, labels, total_amount):
+    """Non-empty allocation buckets, largest first"""
+    buckets = []
+    for key, label in labels.items():
+        amount = totals[f'{prefix}_{key}'] or Decimal('0')
+        if amount <= 0:
+            continue
+        buckets.append({
+            'key': key,
+            'label': label,
+            'amount': decimal_string(amount),
+            'percentage': round(float(amount / total_amount * 100), 2) if total_amount else 0.0,
+            'projected_return': decimal_string(totals[f'{prefix}_{key}_return'] or Decimal('0')),
+        })
+    return sorted(buckets, key=lambda bucket: -float(bucket['amount']))
+
+
+def portfolio_summary(profile):
+    """
+    Totals and allocations of a profile's active recommendations.
+
+    Every figure comes from one aggregate query, using conditional sums per
+    investment type and risk level over the with_portfolio_metrics annotations.
+    """
+    aggregates = {
+        'count': Count('id'),
+        'total_amount': Sum('recommended_amount'),
+        'total_return': Sum('projected_return', output_field=METRIC_FIELD),
+    }
+    for prefix, field, choices in (
+        ('type', 'investment__type', Investment.INVESTMENT_TYPES),
+        ('risk', 'investment__risk_level', RiskProfile.RISK_LEVELS),
+    ):
+        for key, _ in choices:
+            condition = Q(**{field: key})
+            aggregates[f'{prefix}_{key}'] = Sum('recommended_amount', filter=condition)
+            aggregates[f'{prefix}_{key}_return'] = Sum('projected_return', filter=condition, output_field=METRIC_FIELD)
+
+    totals = InvestmentRecommendation.objects.filter(
+        risk_profile=profile,
+        is_active=True
+    ).with_portfolio_metrics().aggregate(**aggregates)
+
+    total_amount = totals['total_amount'] or Decimal('0')
+    total_return = totals['total_return'] or Decimal('0')
+    return {
+        'profile_id': profile.id,
+        'investment_amount': decimal_string(profile.investment_amount),
+        'recommendation_count': totals['count'],
+        'total_recommended': decimal_string(total_amount),
+        'unallocated': decimal_string(max(profile.investment_amount - total_amount, Decimal('0'))),
+        'total_projected_return': decimal_string(total_return),
+        'projected_return_rate': round(float(total_return / total_amount * 100), 2) if total_amount else 0.0,
+        'allocation_by_type': _allocation(totals, 'type', TYPE_LABELS, total_amount),
+        'allocation_by_risk_level': _allocation(totals, 'risk', RISK_LABELS, total_amount),
+    }
@@ -0,0 +1,85 @@
+import gzip
+import hashlib
+import json
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+DEFAULT_PRECOMPILED_SETTINGS = {
+    'MAX_AGE': 60 * 60,
+    'STALE_WHILE_REVALIDATE': 24 * 60 * 60,
+}
+
+
+def precompiled_setting(name):
+    """Read a PRECOMPILED_RESPONSES setting, falling back to the defaults"""
+    return getattr(settings, 'PRECOMPILED_RESPONSES', {}).get(name, DEFAULT_PRECOMPILED_SETTINGS[name])
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts, from an Accept-Encoding header"""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class PrecompiledJSON:
+    """
+    A JSON payload encoded once, with gzip and (when available) brotli variants.
+
+    Each variant gets a strong ETag derived from its bytes, so identical
+    deployments agree on validators and shared caches can key on them.
+    """
+
+    def __init__(self, data):
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.variants = {None: body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body, quality=11)
+
+        self.etags = {
+            coding: '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+            for coding, content in self.variants.items()
+        }
+
+    def select(self, request):
+        """The best content coding for the request; None means identity"""
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding'))
+        for coding in ('br', 'gzip'):
+            if coding in self.variants and (coding in accepted or '*' in accepted):
+                return coding
+        return None
+
+    def respond(self, request):
+        coding = self.select(request)
+
+        # Variants carry the same representation, so any of their validators matches
+        client_etags = set(parse_etags(request.headers.get('If-None-Match', '')))
+        if client_etags & set(self.etags.values()) or '*' in client_etags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(self.variants[coding], content_type='application/json')
+            if coding:
+                response['Content-Encoding'] = coding
+
+        response['ETag'] = self.etags[coding]
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = 'public, max-age=%d, stale-while-revalidate=%d' % (
+            precompiled_setting('MAX_AGE'), precompiled_setting('STALE_WHILE_REVALIDATE')
+        )
+        return response
@@ -0,0 +1,142 @@
+"""
+Compaction of deactivated recommendations into RecommendationHistory.
+
+Replacing a recommendation set only flips the old rows to is_active=False,
+which keeps profile updates cheap. compact_recommendations later moves those
+rows to the history table in batches, so InvestmentRecommendation holds little
+beyond the active sets the hot paths read.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import InvestmentRecommendation, RecommendationHistory
+from .pagination import InvalidCursor, cursor_sort, decode_cursor, encode_cursor
+
+DEFAULT_RETENTION_SETTINGS = {
+    'BATCH_SIZE': 1000,
+    # Rows deactivated more recently stay put, since an edit that is quickly
+    # reverted reactivates them in place
+    'MIN_AGE': 60 * 60,
+}
+
+
+def retention_setting(name):
+    """Read a RECOMMENDATION_RETENTION setting, falling back to the defaults"""
+    return getattr(settings, 'RECOMMENDATION_RETENTION', {}).get(name, DEFAULT_RETENTION_SETTINGS[name])
+
+
+def pending_entry(recommendation):
+    """A history entry for a recommendation that has not been compacted yet"""
+    entry = history_entry(recommendation)
+    entry.investment = recommendation.investment
+    return entry
+
+
+def history_entry(recommendation):
+    """An unsaved RecommendationHistory row for a deactivated recommendation"""
+    return RecommendationHistory(
+        risk_profile_id=recommendation.risk_profile_id,
+        investment_id=recommendation.investment_id,
+        recommended_amount=recommendation.recommended_amount,
+        ai_rationale=recommendation.ai_rationale,
+        confidence_score=recommendation.confidence_score,
+        recommended_at=recommendation.created_at,
+        deactivated_at=recommendation.updated_at,
+    )
+
+
+def _after(cursor, kind, time_field):
+    """Filter for the rows after a keyset cursor of this kind"""
+    value, row_id = decode_cursor(cursor, kind)
+    position = parse_datetime(value)
+    if position is None:
+        raise InvalidCursor('Malformed cursor position')
+    return Q(**{f'{time_field}__lt': position}) | Q(**{time_field: position, 'id__lt': row_id})
+
+
+def history_page(profile, cursor, page_size):
+    """
+    One page of a profile's past recommendations, newest deactivation first.
+
+    Deactivated rows still waiting for compaction are the most recent, so they
+    are listed first, as unsaved entries without an id, followed by the
+    history table. Both parts are keyset-paginated: a 'pending' cursor seeks
+    on the recommendation's (updated_at, id), a 'history' cursor on the
+    history row's (deactivated_at, id). Returns at most page_size entries
+    and the cursor for the next page, or None.
+    """
+    history = RecommendationHistory.objects.filter(risk_profile=profile).select_related('investment')
+    entries = []
+    last_pending = None
+    if not cursor or cursor_sort(cursor) == 'pending':
+        pending = InvestmentRecommendation.objects.filter(
+            risk_profile=profile, is_active=False
+        ).select_related('investment').order_by('-updated_at', '-id')
+        if cursor:
+            pending = pending.filter(_after(cursor, 'pending', 'updated_at'))
+        recommendations = list(pending[:page_size + 1])
+        if len(recommendations) > page_size:
+            last = recommendations[page_size - 1]
+            return (
+                [pending_entry(recommendation) for recommendation in recommendations[:page_size]],
+                encode_cursor('pending', last.updated_at.isoformat(), last.id),
+            )
+        entries = [pending_entry(recommendation) for recommendation in recommendations]
+        last_pending = recommendations[-1] if recommendations else None
+    else:
+        history = history.filter(_after(cursor, 'history', 'deactivated_at'))
+
+    remaining = page_size - len(entries)
+    rows = list(history.order_by('-deactivated_at', '-id')[:remaining + 1])
+    next_cursor = None
+    if len(rows) > remaining:
+        if remaining:
+            last = rows[remaining - 1]
+            next_cursor = encode_cursor('history', last.deactivated_at.isoformat(), last.id)
+        else:
+            # The page filled up with pending rows; the next one starts the history table
+            next_cursor = encode_cursor('pending', last_pending.updated_at.isoformat(), last_pending.id)
+    return entries + rows[:remaining], next_cursor
+
+
+def compact_batch(batch_size, deactivated_before):
+    """Move one batch of deactivated recommendations to history; returns how many moved"""
+    with transaction.atomic():
+        # Locked on databases that support it, so a concurrent reactivation
+        # either lands first (and the row is skipped) or waits for the move
+        batch = list(
+            InvestmentRecommendation.objects.select_for_update(skip_locked=True)
+            .filter(is_active=False, updated_at__lt=deactivated_before)
+            .order_by('updated_at', 'id')[:batch_size]
+        )
+        if not batch:
+            return 0
+        RecommendationHistory.objects.bulk_create([history_entry(recommendation) for recommendation in batch])
+        InvestmentRecommendation.objects.filter(
+            id__in=[recommendation.id for recommendation in batch], is_active=False
+        ).delete()
+    return len(batch)
+
+
+def compact_recommendations(batch_size=None, min_age=None, max_batches=None):
+    """
+    Move deactivated recommendations older than min_age seconds to history.
+
+    Each batch is its own transaction, so writers are blocked for one batch at
+    a time. Returns the number of rows moved.
+    """
+    batch_size = batch_size or retention_setting('BATCH_SIZE')
+    min_age = retention_setting('MIN_AGE') if min_age is None else min_age
+    deactivated_before = timezone.now() - timedelta(seconds=min_age)
+
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = compact_batch(batch_size, deactivated_before)
+        moved += count
+        batches += 1
+        if count < batch_size:
+            break
+    return moved
@@ -0,0 +1,135 @@
+import re
+from django.db import OperationalError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# SQLite FTS5 index over the investment text, in English and Swahili. It is an
+# external-content table, so it stores only the index and reads rows back from
+# investments_investment; triggers keep it in sync with every write.
+FTS_TABLE = 'investments_investment_fts'
+
+FTS_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, description, local_description, "
+    "content='investments_investment', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+FTS_TRIGGERS_SQL = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON investments_investment BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, local_description)
+        VALUES (new.id, new.name, new.description, new.local_description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON investments_investment BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, local_description)
+        VALUES ('delete', old.id, old.name, old.description, old.local_description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF name, description, local_description ON investments_investment BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, local_description)
+        VALUES ('delete', old.id, old.name, old.description, old.local_description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description, local_description)
+        VALUES (new.id, new.name, new.description, new.local_description);
+    END""",
+]
+
+FTS_TRIGGER_NAMES = [f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au']
+
+# Longer queries are truncated rather than rejected
+MAX_SEARCH_TERMS = 8
+
+_fts_available = {}
+
+
+def search_terms(text):
+    """Lowercase word tokens of a search query"""
+    return re.findall(r'\w+', (text or '').casefold())[:MAX_SEARCH_TERMS]
+
+
+def fts_available(connection):
+    """Whether the FTS5 index exists on this database, checked once per process"""
+    if connection.alias not in _fts_available:
+        _fts_available[connection.alias] = (
+            connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available[connection.alias]
+
+
+def ensure_search_index(connection):
+    """
+    Create the FTS5 index and its triggers if missing, rebuilding it when any were.
+
+    SQLite migrations that remake investments_investment drop its triggers, so
+    this also runs after every migrate. Returns whether the index is usable;
+    databases without FTS5 fall back to substring search.
+    """
+    _fts_available.pop(connection.alias, None)
+    if connection.vendor != 'sqlite':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s)" % ', '.join(['%s'] * 4),
+            [FTS_TABLE] + FTS_TRIGGER_NAMES,
+        )
+        if len(cursor.fetchall()) == 4:
+            return True
+        try:
+            cursor.execute(FTS_TABLE_SQL)
+        except OperationalError:
+            # SQLite built without FTS5
+            return False
+        for statement in FTS_TRIGGERS_SQL:
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def drop_search_index(connection):
+    _fts_available.pop(connection.alias, None)
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in FTS_TRIGGER_NAMES:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def search_investments(queryset, text):
+    """Investments matching every word of text, as a prefix, in name or either description"""
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+
+    if fts_available(connections[queryset.db]):
+        # Terms are \w+ tokens, so quoting them cannot break the MATCH syntax
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+        ))
+
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(name__icontains=term) | Q(description__icontains=term) | Q(local_description__icontains=term)
+        )
+    return queryset.filter(condition)
+
+
+def filter_investments(queryset, filters):
+    """Apply validated InvestmentQuerySerializer filters to an investments queryset"""
+    if filters.get('type'):
+        queryset = queryset.filter(type__in=filters['type'])
+    if filters.get('risk_level'):
+        queryset = queryset.filter(risk_level__in=filters['risk_level'])
+    if filters.get('min_amount') is not None:
+        queryset = queryset.filter(minimum_amount__gte=filters['min_amount'])
+    if filters.get('max_amount') is not None:
+        queryset = queryset.filter(minimum_amount__lte=filters['max_amount'])
+    if filters.get('min_return') is not None:
+        queryset = queryset.filter(expected_return__gte=filters['min_return'])
+    if filters.get('max_return') is not None:
+        queryset = queryset.filter(expected_return__lte=filters['max_return'])
+    if filters.get('q'):
+        queryset = search_investments(queryset, filters['q'])
+    return queryset
@@ -1,15 +1,20 @@
 from rest_framework import serializers
-from django.contrib.auth.models import User
-from .models import RiskProfile, Investment, InvestmentRecommendation
+from django.contrib.auth import get_user_model
+from users.serializers import DynamicFieldsMixin
+from .models import RiskProfile, Investment, InvestmentRecommendation, RecommendationHistory, RecommendationJob
+from .montecarlo import projection_setting
 
-class UserSerializer(serializers.ModelSerializer):
+User = get_user_model()
+
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Basic user serializer for nested representation"""
     class Meta:
         model = User
+        resource_name = 'user'
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
         read_only_fields = ['id']
 
-class RiskProfileSerializer(serializers.ModelSerializer):
+class RiskProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     investment_timeline_years = serializers.ReadOnlyField()
     monthly_investment_capacity = serializers.ReadOnlyField()
@@ -17,6 +22,7 @@ class RiskProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = RiskProfile
+        resource_name = 'profile'
         fields = [
             'id', 'user', 'age', 'monthly_income', 'investment_amount', 
             'risk_tolerance', 'risk_tolerance_display', 'investment_timeline', 
@@ -60,13 +66,14 @@ class RiskProfileSerializer(serializers.ModelSerializer):
         
         return data
 
-class InvestmentSerializer(serializers.ModelSerializer):
+class InvestmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     type_display = serializers.CharField(source='get_type_display', read_only=True)
     risk_level_display = serializers.CharField(source='get_risk_level_display', read_only=True)
     expected_return_decimal = serializers.ReadOnlyField()
     
     class Meta:
         model = Investment
+        resource_name = 'investment'
         fields = [
             'id', 'name', 'type', 'type_display', 'minimum_amount', 
             'expected_return', 'expected_return_decimal', 'risk_level', 
@@ -74,6 +81,7 @@ class InvestmentSerializer(serializers.ModelSerializer):
             'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        language_fields = {'en': ['description'], 'sw': ['local_description']}
     
     def validate_expected_return(self, value):
         """Validate expected return is reasonable"""
@@ -89,8 +97,9 @@ class InvestmentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Minimum amount must be greater than 0.")
         return value
 
-class InvestmentRecommendationSerializer(serializers.ModelSerializer):
+class InvestmentRecommendationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     investment = InvestmentSerializer(read_only=True)
+    # Nested by default, as before sparse fieldsets; ?fields= or ?fields[profile]= trims it
     risk_profile = RiskProfileSerializer(read_only=True)
     percentage_of_portfolio = serializers.ReadOnlyField()
     projected_annual_return = serializers.ReadOnlyField()
@@ -101,6 +110,7 @@ class InvestmentRecommendationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = InvestmentRecommendation
+        resource_name = 'recommendation'
         fields = [
             'id', 'risk_profile', 'risk_profile_id', 'investment', 'investment_id',
             'recommended_amount', 'ai_rationale', 'confidence_score', 
@@ -193,16 +203,93 @@ class RiskProfileCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Monthly income must be greater than 0.")
         return value
 
-class InvestmentSummarySerializer(serializers.ModelSerializer):
+class InvestmentSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for investment listings"""
     type_display = serializers.CharField(source='get_type_display', read_only=True)
     risk_level_display = serializers.CharField(source='get_risk_level_display', read_only=True)
     
     class Meta:
         model = Investment
+        resource_name = 'investment'
         fields = [
             'id', 'name', 'type', 'type_display', 'minimum_amount', 
             'expected_return', 'risk_level', 'risk_level_display'
         ]
 
-    
\ No newline at end of file
+class RecommendationHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """A past recommendation; id and archived_at are null until compaction moves it to history"""
+    investment = InvestmentSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = RecommendationHistory
+        resource_name = 'history'
+        fields = [
+            'id', 'investment', 'recommended_amount', 'ai_rationale', 'confidence_score',
+            'recommended_at', 'deactivated_at', 'archived_at'
+        ]
+        read_only_fields = fields
+
+class RecommendationJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Status of a queued recommendation generation job"""
+    risk_profile_id = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = RecommendationJob
+        resource_name = 'job'
+        fields = [
+            'id', 'risk_profile_id', 'status', 'attempts', 'max_attempts',
+            'last_error', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+class InvestmentQuerySerializer(serializers.Serializer):
+    """Validates the filter, search and sort parameters of the investments listing"""
+    type = serializers.CharField(required=False, help_text="Comma-separated investment types")
+    risk_level = serializers.CharField(required=False, help_text="Comma-separated risk levels")
+    min_amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, min_value=0)
+    max_amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, min_value=0)
+    min_return = serializers.DecimalField(max_digits=5, decimal_places=2, required=False, min_value=0)
+    max_return = serializers.DecimalField(max_digits=5, decimal_places=2, required=False, min_value=0)
+    q = serializers.CharField(required=False, max_length=200, help_text="Search text, English or Swahili")
+    sort = serializers.ChoiceField(
+        choices=['name', 'expected_return', '-expected_return', 'minimum_amount', '-minimum_amount'],
+        required=False,
+        default='name'
+    )
+    
+    def _choices(self, value, choices):
+        selected = [item.strip() for item in value.split(',') if item.strip()]
+        valid = {choice for choice, _ in choices}
+        invalid = [item for item in selected if item not in valid]
+        if invalid:
+            raise serializers.ValidationError(f"Unknown values: {', '.join(invalid)}.")
+        return selected
+    
+    def validate_type(self, value):
+        return self._choices(value, Investment.INVESTMENT_TYPES)
+    
+    def validate_risk_level(self, value):
+        return self._choices(value, RiskProfile.RISK_LEVELS)
+    
+    def validate(self, data):
+        """Ranges must not be inverted"""
+        for low, high in (('min_amount', 'max_amount'), ('min_return', 'max_return')):
+            if data.get(low) is not None and data.get(high) is not None and data[low] > data[high]:
+                raise serializers.ValidationError(f"{low} cannot be greater than {high}.")
+        return data
+
+class LLMUsageQuerySerializer(serializers.Serializer):
+    """Validates the parameters of the LLM usage report"""
+    days = serializers.IntegerField(required=False, min_value=1, max_value=3650, default=7)
+    date = serializers.DateField(required=False, help_text="A single day, YYYY-MM-DD; overrides days")
+    user = serializers.IntegerField(required=False, min_value=1, help_text="User id")
+
+
+class ProjectionQuerySerializer(serializers.Serializer):
+    """Validates the parameters of the portfolio projection"""
+    target = serializers.DecimalField(max_digits=14, decimal_places=2, required=False, min_value=0)
+    monthly_contribution = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, min_value=0, default=0)
+    paths = serializers.IntegerField(required=False, min_value=100)
+    
+    def validate_paths(self, value):
+        return min(value, projection_setting('MAX_PATHS'))
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from .catalog import investment_catalog
+from .context import forget_profile
+from .engine import local_engine
+from .pagination import invalidate_investment_counts
+from .models import Investment, InvestmentRecommendation, RiskProfile
+from .search import ensure_search_index
+from .snapshots import discard_profile_snapshots, rebuild_profile_snapshot
+
+
+@receiver(post_save, sender=Investment)
+def refresh_investment_catalog(sender, instance, **kwargs):
+    """Keep catalog-derived state current after an Investment is saved"""
+    transaction.on_commit(lambda: investment_catalog.store([instance]))
+    transaction.on_commit(invalidate_investment_counts)
+    local_engine.invalidate()
+    discard_profile_snapshots(user__risk_profiles__recommendations__investment=instance)
+
+
+@receiver(post_delete, sender=Investment)
+def evict_investment_catalog(sender, instance, **kwargs):
+    """Drop a deleted Investment from catalog-derived state"""
+    transaction.on_commit(lambda: investment_catalog.discard(instance))
+    transaction.on_commit(invalidate_investment_counts)
+    local_engine.invalidate()
+
+
+@receiver(post_save, sender=RiskProfile)
+def refresh_profile_snapshot(sender, instance, **kwargs):
+    """Rebuild the profile's snapshot once the save commits"""
+    transaction.on_commit(lambda: rebuild_profile_snapshot(instance))
+
+
+@receiver(post_delete, sender=RiskProfile)
+def discard_deleted_profile_snapshot(sender, instance, **kwargs):
+    """
+    Drop the user's snapshot when their profile is deleted.
+
+    A profile without active recommendations cascades to no recommendation
+    signal, so nothing else would. On commit, so it follows any rebuild the
+    same transaction queued.
+    """
+    transaction.on_commit(lambda: discard_profile_snapshots(user_id=instance.user_id))
+
+
+@receiver(post_save, sender=RiskProfile)
+@receiver(post_delete, sender=RiskProfile)
+def forget_cached_profile(sender, instance, **kwargs):
+    """Drop the profile from the per-user request context cache"""
+    forget_profile(instance.user_id)
+
+
+@receiver(post_save, sender=InvestmentRecommendation)
+@receiver(post_delete, sender=InvestmentRecommendation)
+def discard_recommendation_snapshot(sender, instance, signal, **kwargs):
+    """Individually edited recommendations invalidate their profile's snapshot"""
+    if signal is post_delete and not instance.is_active:
+        # Snapshots hold only active rows, so compaction leaves them valid
+        return
+    discard_profile_snapshots(user__risk_profiles=instance.risk_profile_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def discard_user_snapshot(sender, instance, **kwargs):
+    """Snapshots embed the user, so drop them when the user changes"""
+    discard_profile_snapshots(user=instance)
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    """Recreate search triggers that a table-rebuilding SQLite migration dropped"""
+    if sender.name == 'investments':
+        ensure_search_index(connections[using])
@@ -0,0 +1,50 @@
+import hashlib
+from auth.renderers import ORJSONRenderer
+from .models import InvestmentRecommendation, ProfileSnapshot
+from .serializers import RiskProfileSerializer
+from .summaries import recommendation_rows
+
+
+def profile_payload(profile, request=None):
+    """The GET /risk-profile/me/ data for a profile and its active recommendations"""
+    recommendations = InvestmentRecommendation.objects.filter(
+        risk_profile=profile,
+        is_active=True
+    ).select_related('investment', 'risk_profile__user')
+    context = {'request': request}
+
+    return {
+        'profile': RiskProfileSerializer(profile, context=context).data,
+        'recommendations': recommendation_rows(recommendations, request, profile)
+    }
+
+
+def render_profile(profile):
+    """The full GET /risk-profile/me/ response body, as stored in the snapshot"""
+    return ORJSONRenderer().render(profile_payload(profile)).decode('utf-8')
+
+
+def rebuild_profile_snapshot(profile):
+    """
+    Re-render a profile's snapshot, bumping its version when the body changed.
+
+    The ETag carries both the version and a digest of the body, so it stays
+    unique even if the snapshot is dropped and its version starts over.
+    """
+    body = render_profile(profile)
+    snapshot = ProfileSnapshot.objects.filter(user_id=profile.user_id).first()
+    if snapshot is not None and snapshot.body == body:
+        return snapshot
+
+    version = snapshot.version + 1 if snapshot is not None else 1
+    digest = hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+    snapshot, _ = ProfileSnapshot.objects.update_or_create(
+        user_id=profile.user_id,
+        defaults={'version': version, 'etag': f'"{version}-{digest}"', 'body': body}
+    )
+    return snapshot
+
+
+def discard_profile_snapshots(**filters):
+    """Drop snapshots so they are rebuilt on next read, e.g. when embedded data changes"""
+    ProfileSnapshot.objects.filter(**filters).delete()
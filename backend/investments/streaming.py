@@ -0,0 +1,88 @@
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a JSON array of objects arriving in fragments.
+
+    Text before the opening bracket (e.g. a markdown fence) is ignored, and
+    each top-level object is decoded as soon as its closing brace arrives.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.buffer = []
+
+    def feed(self, text):
+        """Consume a fragment and return the objects completed by it"""
+        completed = []
+
+        for char in text:
+            if self.finished:
+                break
+
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                continue
+
+            if self.depth == 0:
+                # Between elements: only an object start or the array end matter
+                if char == '{':
+                    self.depth = 1
+                    self.buffer = [char]
+                elif char == ']':
+                    self.finished = True
+                continue
+
+            self.buffer.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        value = json.loads(''.join(self.buffer))
+                    except json.JSONDecodeError:
+                        value = None
+                    if isinstance(value, dict):
+                        completed.append(value)
+                    self.buffer = []
+
+        return completed
+
+
+def sse_event(event, data):
+    """Encode one server-sent event"""
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f"event: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets views negotiate text/event-stream; non-streamed bodies become a single event"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        event = 'error' if response is not None and response.status_code >= 400 else 'message'
+        return sse_event(event, data)
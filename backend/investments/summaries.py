@@ -0,0 +1,148 @@
+"""
+Projection-based read path for list endpoints.
+
+Rows are read with values() and turned into plain dicts with precomputed
+choice-label maps, producing the same output as the DRF serializers (field
+selection and language controls included) without building model instances
+or running per-field serializer machinery.
+"""
+from decimal import Decimal
+from django.utils import timezone
+from .models import Investment, RiskProfile
+from .serializers import InvestmentRecommendationSerializer, InvestmentSerializer, InvestmentSummarySerializer
+
+TYPE_LABELS = dict(Investment.INVESTMENT_TYPES)
+RISK_LABELS = dict(RiskProfile.RISK_LEVELS)
+
+INVESTMENT_COLUMNS = [
+    'id', 'name', 'type', 'minimum_amount', 'expected_return', 'risk_level',
+    'description', 'local_description', 'is_active', 'created_at', 'updated_at'
+]
+
+RECOMMENDATION_COLUMNS = [
+    'id', 'risk_profile_id', 'recommended_amount', 'ai_rationale', 'confidence_score',
+    'is_active', 'created_at', 'updated_at', 'risk_profile__investment_amount'
+] + [f'investment__{column}' for column in INVESTMENT_COLUMNS]
+
+SUMMARY_COLUMNS = ['id', 'name', 'type', 'minimum_amount', 'expected_return', 'risk_level']
+
+
+def decimal_string(value, places=2):
+    """Format a Decimal the way DRF's DecimalField does"""
+    if value is None:
+        return None
+    return '{:f}'.format(value.quantize(Decimal(1).scaleb(-places)))
+
+
+def timestamp(value):
+    """Format an aware datetime the way DRF's DateTimeField does"""
+    if value is None:
+        return None
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def output_fields(serializer):
+    """The keys a serializer will produce for its request, after DynamicFieldsMixin trimming"""
+    return [name for name, field in serializer.fields.items() if not field.write_only]
+
+
+def _project(rows, keys, all_keys):
+    if keys == all_keys:
+        return rows
+    return [{key: row[key] for key in keys} for row in rows]
+
+
+def investment_row(values, prefix=''):
+    """InvestmentSerializer output for one values() row"""
+    expected_return = values[f'{prefix}expected_return']
+    return {
+        'id': values[f'{prefix}id'],
+        'name': values[f'{prefix}name'],
+        'type': values[f'{prefix}type'],
+        'type_display': TYPE_LABELS.get(values[f'{prefix}type'], values[f'{prefix}type']),
+        'minimum_amount': decimal_string(values[f'{prefix}minimum_amount']),
+        'expected_return': decimal_string(expected_return),
+        'expected_return_decimal': expected_return / 100,
+        'risk_level': values[f'{prefix}risk_level'],
+        'risk_level_display': RISK_LABELS.get(values[f'{prefix}risk_level'], values[f'{prefix}risk_level']),
+        'description': values[f'{prefix}description'],
+        'local_description': values[f'{prefix}local_description'],
+        'is_active': values[f'{prefix}is_active'],
+        'created_at': timestamp(values[f'{prefix}created_at']),
+        'updated_at': timestamp(values[f'{prefix}updated_at']),
+    }
+
+
+def investment_summary_rows(queryset, request=None):
+    """InvestmentSummarySerializer(queryset, many=True).data as plain dicts"""
+    keys = output_fields(InvestmentSummarySerializer(context={'request': request}))
+    rows = [
+        {
+            'id': values['id'],
+            'name': values['name'],
+            'type': values['type'],
+            'type_display': TYPE_LABELS.get(values['type'], values['type']),
+            'minimum_amount': decimal_string(values['minimum_amount']),
+            'expected_return': decimal_string(values['expected_return']),
+            'risk_level': values['risk_level'],
+            'risk_level_display': RISK_LABELS.get(values['risk_level'], values['risk_level']),
+        }
+        for values in queryset.values(*SUMMARY_COLUMNS)
+    ]
+    return _project(rows, keys, InvestmentSummarySerializer.Meta.fields)
+
+
+def investment_rows(queryset, request=None):
+    """InvestmentSerializer(queryset, many=True).data as plain dicts"""
+    keys = output_fields(InvestmentSerializer(context={'request': request}))
+    rows = [investment_row(values) for values in queryset.values(*INVESTMENT_COLUMNS)]
+    return _project(rows, keys, InvestmentSerializer.Meta.fields)
+
+
+def recommendation_rows(queryset, request=None, profile=None):
+    """
+    InvestmentRecommendationSerializer(queryset, many=True).data as plain dicts.
+
+    The nested risk_profile is rendered by its own serializer, once per
+    distinct profile: a listing's rows share one profile, or a few. Pass
+    profile when every row belongs to it to skip loading it again.
+    """
+    serializer = InvestmentRecommendationSerializer(context={'request': request})
+    keys = output_fields(serializer)
+    investment_keys = output_fields(serializer.fields['investment']) if 'investment' in keys else None
+
+    all_values = list(queryset.values(*RECOMMENDATION_COLUMNS))
+    profiles = {}
+    if 'risk_profile' in keys:
+        profile_field = serializer.fields['risk_profile']
+        if profile is not None:
+            loaded = [profile]
+        else:
+            profile_ids = {values['risk_profile_id'] for values in all_values}
+            loaded = RiskProfile.objects.filter(pk__in=profile_ids).select_related('user')
+        profiles = {loaded_profile.id: profile_field.to_representation(loaded_profile) for loaded_profile in loaded}
+
+    rows = []
+    for values in all_values:
+        amount = values['recommended_amount']
+        total = values['risk_profile__investment_amount']
+        row = {
+            'id': values['id'],
+            'risk_profile': profiles.get(values['risk_profile_id']),
+            'recommended_amount': decimal_string(amount),
+            'ai_rationale': values['ai_rationale'],
+            'confidence_score': decimal_string(values['confidence_score']),
+            'percentage_of_portfolio': (amount / total) * 100 if total > 0 else 0,
+            'projected_annual_return': amount * (values['investment__expected_return'] / 100),
+            'is_active': values['is_active'],
+            'created_at': timestamp(values['created_at']),
+            'updated_at': timestamp(values['updated_at']),
+        }
+        if investment_keys is not None:
+            investment = investment_row(values, prefix='investment__')
+            row['investment'] = {key: investment[key] for key in investment_keys}
+        rows.append({key: row[key] for key in keys})
+    return rows
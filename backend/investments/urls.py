@@ -6,13 +6,26 @@ app_name = 'investments'
 urlpatterns = [
     # Risk Profile Management
     path('api/risk-profile/', views.create_risk_profile, name='create_risk_profile'),
+    path('api/risk-profile/stream/', views.stream_risk_profile, name='stream_risk_profile'),
     path('api/risk-profile/me/', views.get_user_profile, name='get_user_profile'),
     path('api/risk-profile/update/', views.update_risk_profile, name='update_risk_profile'),
+    path('api/risk-profile/history/', views.get_recommendation_history, name='get_recommendation_history'),
+    path('api/risk-profile/jobs/<int:job_id>/', views.get_recommendation_job, name='get_recommendation_job'),
     
     # Investment Information
     path('api/investment-types/', views.get_investment_types, name='get_investment_types'),
     path('api/investments/', views.get_investments, name='get_investments'),
     
+    # Portfolio
+    path('api/portfolio/summary/', views.get_portfolio_summary, name='get_portfolio_summary'),
+    path('api/portfolio/projection/', views.get_portfolio_projection, name='get_portfolio_projection'),
+    
+    # Operations
+    path('api/recommendations/cache/stats/', views.get_recommendation_cache_stats, name='get_recommendation_cache_stats'),
+    path('api/recommendations/batching/stats/', views.get_recommendation_batching_stats, name='get_recommendation_batching_stats'),
+    path('api/recommendations/llm/stats/', views.get_llm_client_stats, name='get_llm_client_stats'),
+    path('api/recommendations/llm/usage/', views.get_llm_usage, name='get_llm_usage'),
+    
     # Legacy endpoint (kept for backward compatibility)
     path('api/investment-recommendations/', views.get_investment_types, name='get_investment_recommendations'),
 ]
\ No newline at end of file
@@ -0,0 +1,220 @@
+import logging
+import math
+import re
+import time
+import openai
+from django.conf import settings
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from .llm import CircuitOpenError
+from .models import LLMCallRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_SETTINGS = {
+    'MAX_GOALS_CHARS': 600,
+    'MAX_TOTAL_TOKENS': 3000,
+    'MAX_COMPLETION_TOKENS': 2000,
+    'MIN_COMPLETION_TOKENS': 600,
+}
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 4000, 8000, 16000]
+
+# Upper bounds of the total-token histogram buckets
+TOKEN_BUCKETS = [500, 1000, 2000, 3000, 4000, 8000]
+
+CHARS_PER_TOKEN = 4
+
+
+def budget_setting(name):
+    """Read an LLM_PROMPT_BUDGET setting, falling back to the defaults"""
+    return getattr(settings, 'LLM_PROMPT_BUDGET', {}).get(name, DEFAULT_BUDGET_SETTINGS[name])
+
+
+def estimate_tokens(text):
+    """Rough token count for text, used when the API does not report usage"""
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+
+def fit_goals(financial_goals):
+    """
+    Shorten free-text goals to MAX_GOALS_CHARS.
+
+    Whole sentences are kept from the start while they fit; if even the first
+    sentence is too long it is cut at a word boundary.
+    """
+    limit = budget_setting('MAX_GOALS_CHARS')
+    text = ' '.join((financial_goals or '').split())
+    if len(text) <= limit:
+        return text
+
+    kept = ''
+    for sentence in re.split(r'(?<=[.!?])\s+', text):
+        candidate = f"{kept} {sentence}".strip()
+        if len(candidate) > limit:
+            break
+        kept = candidate
+    if kept:
+        return kept
+
+    return text[:limit].rsplit(' ', 1)[0] + '…'
+
+
+def completion_budget(messages, profiles=1):
+    """max_tokens for a call so prompt plus completion stays within budget"""
+    prompt_tokens = sum(estimate_tokens(message['content']) for message in messages)
+    allowed = budget_setting('MAX_TOTAL_TOKENS') * profiles - prompt_tokens
+    return max(
+        budget_setting('MIN_COMPLETION_TOKENS') * profiles,
+        min(budget_setting('MAX_COMPLETION_TOKENS') * profiles, allowed),
+    )
+
+
+class LLMCallTracker:
+    """
+    Measures one recommendation call and records its outcome.
+
+    Create it just before calling the model, pass the response (or streamed
+    text) to observe(), then call succeed() or fall_back(reason). A batch call
+    is recorded as one row per profile, with tokens split evenly.
+    """
+
+    def __init__(self, kind, model, messages=None, user_ids=()):
+        self.kind = kind
+        self.model = model
+        self.user_ids = list(user_ids) or [None]
+        self.prompt_tokens = sum(estimate_tokens(message['content']) for message in messages or [])
+        self.completion_tokens = 0
+        self.completion_text = []
+        self.usage_reported = False
+        self.started = time.monotonic()
+        self.latency_ms = 0
+        self.recorded = False
+
+    def observe(self, response):
+        """Take latency, model and token usage from an API response or stream chunk"""
+        self.latency_ms = int((time.monotonic() - self.started) * 1000)
+        self.model = getattr(response, 'model', None) or self.model
+        usage = getattr(response, 'usage', None)
+        if usage:
+            self.prompt_tokens = usage.prompt_tokens
+            self.completion_tokens = usage.completion_tokens
+            self.usage_reported = True
+
+    def observe_text(self, text):
+        """Accumulate streamed completion text for token estimates"""
+        self.completion_text.append(text)
+
+    def succeed(self):
+        self._record(LLMCallRecord.OUTCOME_SUCCESS, '')
+
+    def fall_back(self, reason):
+        self._record(LLMCallRecord.OUTCOME_FALLBACK, reason)
+
+    def _record(self, outcome, reason):
+        if self.recorded:
+            return
+        self.recorded = True
+
+        if not self.latency_ms:
+            self.latency_ms = int((time.monotonic() - self.started) * 1000)
+        if not self.usage_reported and self.completion_text:
+            self.completion_tokens = estimate_tokens(''.join(self.completion_text))
+
+        shares = len(self.user_ids)
+        try:
+            LLMCallRecord.objects.bulk_create([
+                LLMCallRecord(
+                    user_id=user_id,
+                    kind=self.kind,
+                    model=self.model or '',
+                    prompt_tokens=self.prompt_tokens // shares,
+                    completion_tokens=self.completion_tokens // shares,
+                    latency_ms=self.latency_ms,
+                    batch_size=shares,
+                    outcome=outcome,
+                    fallback_reason=reason,
+                )
+                for user_id in self.user_ids
+            ])
+        except Exception as e:
+            logger.error(f"Error recording LLM call: {e}")
+
+
+def fallback_reason(error):
+    """Short machine-readable reason for an exception that forced a fallback"""
+    if isinstance(error, CircuitOpenError):
+        return LLMCallRecord.REASON_CIRCUIT_OPEN
+    if isinstance(error, (TimeoutError, openai.APITimeoutError)):
+        return LLMCallRecord.REASON_TIMEOUT
+    if isinstance(error, (ValueError, TypeError, KeyError)):
+        return LLMCallRecord.REASON_PARSE_ERROR
+    return LLMCallRecord.REASON_API_ERROR
+
+
+def _histogram(field, bounds):
+    """Conditional counts per bucket, so a histogram costs no extra queries"""
+    buckets, lower = {}, 0
+    for index, upper in enumerate(bounds):
+        buckets[f'{field}_bucket_{index}'] = Count('id', filter=Q(**{f'{field}__gte': lower, f'{field}__lt': upper}))
+        lower = upper
+    buckets[f'{field}_bucket_{len(bounds)}'] = Count('id', filter=Q(**{f'{field}__gte': lower}))
+    return buckets
+
+
+def _bucket_labels(bounds, unit=''):
+    labels, lower = [], 0
+    for upper in bounds:
+        labels.append(f"{lower}-{upper}{unit}")
+        lower = upper
+    labels.append(f"{lower}{unit}+")
+    return labels
+
+
+def usage_summary(records):
+    """Daily token, latency and outcome aggregates for a queryset of LLMCallRecord"""
+    rows = (
+        records
+        .annotate(total_tokens=F('prompt_tokens') + F('completion_tokens'))
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(
+            calls=Count('id'),
+            prompt_tokens_sum=Sum('prompt_tokens'),
+            completion_tokens_sum=Sum('completion_tokens'),
+            average_latency_ms=Avg('latency_ms'),
+            fallbacks=Count('id', filter=Q(outcome=LLMCallRecord.OUTCOME_FALLBACK)),
+            **_histogram('latency_ms', LATENCY_BUCKETS_MS),
+            **_histogram('total_tokens', TOKEN_BUCKETS),
+        )
+        .order_by('day')
+    )
+
+    latency_labels = _bucket_labels(LATENCY_BUCKETS_MS, 'ms')
+    token_labels = _bucket_labels(TOKEN_BUCKETS)
+    days = []
+    for row in rows:
+        days.append({
+            'date': row['day'],
+            'calls': row['calls'],
+            'prompt_tokens': row['prompt_tokens_sum'] or 0,
+            'completion_tokens': row['completion_tokens_sum'] or 0,
+            'average_latency_ms': round(row['average_latency_ms'] or 0),
+            'fallbacks': row['fallbacks'],
+            'latency_histogram': {
+                label: row[f'latency_ms_bucket_{index}'] for index, label in enumerate(latency_labels)
+            },
+            'token_histogram': {
+                label: row[f'total_tokens_bucket_{index}'] for index, label in enumerate(token_labels)
+            },
+        })
+
+    reasons = dict(
+        records.filter(outcome=LLMCallRecord.OUTCOME_FALLBACK)
+        .values_list('fallback_reason')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+    return {'days': days, 'fallback_reasons': reasons}
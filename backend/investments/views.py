@@ -1,28 +1,58 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import get_object_or_404
 import json
 import logging
+from datetime import timedelta
 from decimal import Decimal, InvalidOperation
 from django.conf import settings
 from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from openai import OpenAI
-from .models import RiskProfile, Investment, InvestmentRecommendation
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from .batching import RecommendationBatcher, batch_setting
+from .cache import cache_setting, recommendation_cache
+from .changes import material_changes
+from .context import request_profile
+from .engine import local_engine
+from .llm import CircuitOpenError, LLMClient
+from .montecarlo import projection_inputs, projection_setting, simulate
+from .pagination import InvalidCursor, investment_count, keyset_page, page_size_param
+from .portfolio import portfolio_summary
+from .precompiled import PrecompiledJSON
+from .persistence import save_recommendations, replace_recommendations
+from .retention import history_page
+from .jobs import enqueue_recommendation_job, job_setting
+from .models import RiskProfile, Investment, InvestmentRecommendation, RecommendationJob, LLMCallRecord, ProfileSnapshot
+from .search import filter_investments
+from .snapshots import profile_payload, rebuild_profile_snapshot
+from .summaries import investment_summary_rows, recommendation_rows
+from .usage import LLMCallTracker, completion_budget, fallback_reason, fit_goals, usage_summary
+from .streaming import EventStreamRenderer, JSONArrayStreamParser, sse_event
 from .serializers import (
     RiskProfileSerializer, 
     RiskProfileCreateSerializer,
-    InvestmentSerializer, 
     InvestmentRecommendationSerializer,
-    InvestmentSummarySerializer
+    InvestmentQuerySerializer,
+    LLMUsageQuerySerializer,
+    ProjectionQuerySerializer,
+    RecommendationHistorySerializer,
+    RecommendationJobSerializer
 )
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=getattr(settings, 'OPENAI_API_KEY', None))
+# Initialize the pooled LLM client
+client = LLMClient.from_settings()
+
+OPENAI_MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are a financial advisor specializing in Kenyan investments. Return only valid JSON arrays."
+BATCH_SYSTEM_PROMPT = "You are a financial advisor specializing in Kenyan investments. Return only valid JSON objects."
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -31,14 +61,7 @@ def create_risk_profile(request):
     Create a new risk profile and get AI-generated investment recommendations.
     """
     try:
-        # Check if user is authenticated
-        if not request.user.is_authenticated:
-            return Response({
-                'error': 'Authentication required',
-                'message': 'Please provide a valid JWT token to create a risk profile'
-            }, status=status.HTTP_401_UNAUTHORIZED)
-        
-        existing_profile = RiskProfile.objects.filter(user=request.user).first()
+        existing_profile = request_profile(request)
         if existing_profile:
             return Response({
                 'error': 'Risk profile already exists for this user',
@@ -49,55 +72,39 @@ def create_risk_profile(request):
         serializer = RiskProfileCreateSerializer(data=request.data)
         
         if serializer.is_valid():
-            with transaction.atomic():
-                # Save profile with current user
-                profile = serializer.save(user=request.user)
+            if use_job_mode(request):
+                with transaction.atomic():
+                    profile = serializer.save(user=request.user)
+                    job = enqueue_recommendation_job(profile)
                 
-                logger.info(f"Created risk profile for user {request.user.id}")
-                
-                # Generate AI recommendations based on the risk profile
-                recommendations = generate_ai_recommendations(profile)
-                
-                # Save recommendations to the database
-                saved_recommendations = []
-                for rec in recommendations:
-                    try:
-                        # Get or create investment
-                        investment, created = Investment.objects.get_or_create(
-                            name=rec['name'],
-                            defaults={
-                                'type': rec['type'],
-                                'minimum_amount': rec['minimum_amount'],
-                                'expected_return': rec['expected_return'],
-                                'risk_level': rec['risk_level'],
-                                'description': rec['description'],
-                                'local_description': rec['local_description'],
-                            }
-                        )
-                        
-                        # Create recommendation
-                        recommendation = InvestmentRecommendation.objects.create(
-                            risk_profile=profile,
-                            investment=investment,
-                            recommended_amount=rec['recommended_amount'],
-                            ai_rationale=rec['rationale'],
-                            confidence_score=rec.get('confidence_score', 0.8)
-                        )
-                        saved_recommendations.append(recommendation)
-                        
-                    except Exception as e:
-                        logger.error(f"Error creating recommendation: {e}")
-                        continue
-                
-                # Serialize the response
-                profile_serializer = RiskProfileSerializer(profile)
-                rec_serializer = InvestmentRecommendationSerializer(saved_recommendations, many=True)
+                logger.info(f"Created risk profile for user {request.user.id}, queued job {job.id}")
                 
                 return Response({
-                    'profile': profile_serializer.data,
-                    'recommendations': rec_serializer.data,
-                    'message': f'Successfully created {len(saved_recommendations)} recommendations'
-                }, status=status.HTTP_201_CREATED)
+                    'profile': RiskProfileSerializer(profile, context={'request': request}).data,
+                    'job': RecommendationJobSerializer(job, context={'request': request}).data,
+                    'message': 'Risk profile created, recommendations are being generated'
+                }, status=status.HTTP_202_ACCEPTED)
+            
+            # Save profile with current user
+            profile = serializer.save(user=request.user)
+            
+            logger.info(f"Created risk profile for user {request.user.id}")
+            
+            # Generate AI recommendations outside of any transaction
+            recommendations = generate_ai_recommendations(profile)
+            
+            with transaction.atomic():
+                saved_recommendations = save_recommendations(profile, recommendations)
+            
+            # Serialize the response
+            profile_serializer = RiskProfileSerializer(profile, context={'request': request})
+            rec_serializer = InvestmentRecommendationSerializer(saved_recommendations, many=True, context={'request': request})
+            
+            return Response({
+                'profile': profile_serializer.data,
+                'recommendations': rec_serializer.data,
+                'message': f'Successfully created {len(saved_recommendations)} recommendations'
+            }, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
@@ -108,31 +115,88 @@ def create_risk_profile(request):
             'detail': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def stream_risk_profile(request):
+    """
+    Create a risk profile and stream recommendations as server-sent events.
+    
+    Each recommendation is saved and sent as soon as the model finishes it.
+    """
+    existing_profile = request_profile(request)
+    if existing_profile:
+        return Response({
+            'error': 'Risk profile already exists for this user',
+            'profile_id': existing_profile.id
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = RiskProfileCreateSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    profile = serializer.save(user=request.user)
+    logger.info(f"Created risk profile for user {request.user.id} (streaming)")
+    
+    def events():
+        yield sse_event('profile', RiskProfileSerializer(profile, context={'request': request}).data)
+        
+        saved_count = 0
+        try:
+            for rec in stream_ai_recommendations(profile):
+                saved = save_recommendations(profile, [rec])
+                if not saved:
+                    continue
+                saved_count += 1
+                yield sse_event('recommendation', InvestmentRecommendationSerializer(saved[0], context={'request': request}).data)
+        except Exception as e:
+            logger.error(f"Error in stream_risk_profile: {e}")
+            yield sse_event('error', {'error': 'Error generating recommendations', 'detail': str(e)})
+        
+        yield sse_event('done', {
+            'profile_id': profile.id,
+            'message': f'Successfully created {saved_count} recommendations'
+        })
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream', status=status.HTTP_201_CREATED)
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def profile_not_found():
+    return Response({
+        'error': 'Risk profile not found',
+        'message': 'Create a risk profile to get recommendations'
+    }, status=status.HTTP_404_NOT_FOUND)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_profile(request):
-    """Get current user's risk profile and recommendations"""
+    """Get current user's risk profile and recommendations from the precomputed snapshot"""
     try:
-        # Check if user is authenticated
-        if not request.user.is_authenticated:
-            return Response({
-                'error': 'Authentication required',
-                'message': 'Please provide a valid JWT token to access your profile'
-            }, status=status.HTTP_401_UNAUTHORIZED)
+        # The snapshot holds the full response, so trimmed responses are built live
+        if any(key in ('expand', 'lang') or key.startswith('fields') for key in request.query_params):
+            profile = request_profile(request)
+            if profile is None:
+                return profile_not_found()
+            return Response(profile_payload(profile, request), status=status.HTTP_200_OK)
         
-        profile = get_object_or_404(RiskProfile, user=request.user)
-        recommendations = InvestmentRecommendation.objects.filter(
-            risk_profile=profile, 
-            is_active=True
-        ).select_related('investment')
-        
-        profile_serializer = RiskProfileSerializer(profile)
-        rec_serializer = InvestmentRecommendationSerializer(recommendations, many=True)
+        snapshot = ProfileSnapshot.objects.filter(user=request.user).only('etag', 'body').first()
+        if snapshot is None:
+            profile = request_profile(request)
+            if profile is None:
+                return profile_not_found()
+            snapshot = rebuild_profile_snapshot(profile)
         
-        return Response({
-            'profile': profile_serializer.data,
-            'recommendations': rec_serializer.data
-        }, status=status.HTTP_200_OK)
+        # Weak comparison, as for any If-None-Match
+        client_etags = {etag.removeprefix('W/') for etag in parse_etags(request.headers.get('If-None-Match', ''))}
+        if snapshot.etag in client_etags or '*' in client_etags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(snapshot.body, content_type='application/json')
+        response['ETag'] = snapshot.etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         logger.error(f"Error in get_user_profile: {e}")
@@ -144,67 +208,52 @@ def get_user_profile(request):
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_risk_profile(request):
-    """Update existing risk profile and regenerate recommendations"""
+    """Update existing risk profile, regenerating recommendations only when a material field changed"""
     try:
-        # Check if user is authenticated
-        if not request.user.is_authenticated:
-            return Response({
-                'error': 'Authentication required',
-                'message': 'Please provide a valid JWT token to update your profile'
-            }, status=status.HTTP_401_UNAUTHORIZED)
-        
-        profile = get_object_or_404(RiskProfile, user=request.user)
+        profile = get_object_or_404(RiskProfile.objects.select_related('user'), user=request.user)
         serializer = RiskProfileCreateSerializer(profile, data=request.data, partial=True)
         
         if serializer.is_valid():
-            with transaction.atomic():
+            changed_fields = material_changes(profile, serializer.validated_data)
+            
+            with transaction.atomic(savepoint=False):
                 profile = serializer.save()
-                
-                # Deactivate old recommendations
-                InvestmentRecommendation.objects.filter(
-                    risk_profile=profile
-                ).update(is_active=False)
-                
-                # Generate new recommendations
-                recommendations = generate_ai_recommendations(profile)
-                
-                # Save new recommendations
-                saved_recommendations = []
-                for rec in recommendations:
-                    try:
-                        investment, created = Investment.objects.get_or_create(
-                            name=rec['name'],
-                            defaults={
-                                'type': rec['type'],
-                                'minimum_amount': rec['minimum_amount'],
-                                'expected_return': rec['expected_return'],
-                                'risk_level': rec['risk_level'],
-                                'description': rec['description'],
-                                'local_description': rec['local_description'],
-                            }
-                        )
-                        
-                        recommendation = InvestmentRecommendation.objects.create(
-                            risk_profile=profile,
-                            investment=investment,
-                            recommended_amount=rec['recommended_amount'],
-                            ai_rationale=rec['rationale'],
-                            confidence_score=rec.get('confidence_score', 0.8)
-                        )
-                        saved_recommendations.append(recommendation)
-                        
-                    except Exception as e:
-                        logger.error(f"Error creating recommendation: {e}")
-                        continue
-                
-                profile_serializer = RiskProfileSerializer(profile)
-                rec_serializer = InvestmentRecommendationSerializer(saved_recommendations, many=True)
-                
+                # An immaterial edit keeps the current recommendations, if there are any
+                current_recommendations = [] if changed_fields else list(
+                    profile.recommendations.filter(is_active=True).select_related('investment')
+                )
+                job = None
+                if not current_recommendations and use_job_mode(request):
+                    job = enqueue_recommendation_job(profile)
+            
+            if current_recommendations:
                 return Response({
-                    'profile': profile_serializer.data,
-                    'recommendations': rec_serializer.data,
-                    'message': 'Profile updated successfully'
+                    'profile': RiskProfileSerializer(profile, context={'request': request}).data,
+                    'recommendations': InvestmentRecommendationSerializer(current_recommendations, many=True, context={'request': request}).data,
+                    'message': 'Profile updated successfully, recommendations unchanged'
                 }, status=status.HTTP_200_OK)
+            
+            if job is not None:
+                return Response({
+                    'profile': RiskProfileSerializer(profile, context={'request': request}).data,
+                    'job': RecommendationJobSerializer(job, context={'request': request}).data,
+                    'message': 'Profile updated, recommendations are being regenerated'
+                }, status=status.HTTP_202_ACCEPTED)
+            
+            # Generate new recommendations outside of any transaction
+            recommendations = generate_ai_recommendations(profile)
+            
+            with transaction.atomic():
+                saved_recommendations = replace_recommendations(profile, recommendations)
+            
+            profile_serializer = RiskProfileSerializer(profile, context={'request': request})
+            rec_serializer = InvestmentRecommendationSerializer(saved_recommendations, many=True, context={'request': request})
+            
+            return Response({
+                'profile': profile_serializer.data,
+                'recommendations': rec_serializer.data,
+                'message': 'Profile updated successfully'
+            }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
@@ -215,25 +264,179 @@ def update_risk_profile(request):
             'detail': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-# ... rest of your functions remain the same ...
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_portfolio_summary(request):
+    """Get totals and type / risk level allocations of the current user's recommended portfolio"""
+    profile = request_profile(request)
+    if profile is None:
+        return profile_not_found()
+    
+    return Response(portfolio_summary(profile), status=status.HTTP_200_OK)
 
-def generate_ai_recommendations(profile):
-    """Generate personalized investment recommendations using OpenAI API"""
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_portfolio_projection(request):
+    """Project the current user's recommended portfolio with a Monte Carlo simulation"""
+    query = ProjectionQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    options = query.validated_data
     
-    if not client or not hasattr(settings, 'OPENAI_API_KEY'):
-        logger.warning("OpenAI API key not configured, using fallback recommendations")
-        return get_fallback_recommendations(profile)
+    profile = request_profile(request)
+    if profile is None:
+        return profile_not_found()
     
-    prompt = f"""
-    Based on the following risk profile, generate personalized investment recommendations for Kenya:
+    inputs = projection_inputs(profile)
+    if inputs is None:
+        return Response({
+            'error': 'No recommendations to project',
+            'message': 'Generate recommendations for your risk profile first'
+        }, status=status.HTTP_404_NOT_FOUND)
     
-    - Age: {profile.age} years
-    - Monthly Income: KSh {profile.monthly_income:,.2f}
-    - Available Investment Amount: KSh {profile.investment_amount:,.2f}
-    - Risk Tolerance: {profile.risk_tolerance}
-    - Investment Timeline: {profile.investment_timeline} months ({profile.investment_timeline_years} years)
-    - Financial Goals: {profile.financial_goals}
+    target = options.get('target')
+    # The work grows with paths x months, so long horizons get fewer paths
+    paths = min(
+        options.get('paths') or projection_setting('PATHS'),
+        max(1, projection_setting('MAX_CELLS') // inputs['months'])
+    )
+    result = simulate(
+        **inputs,
+        paths=paths,
+        monthly_contribution=float(options['monthly_contribution']),
+        target=float(target) if target is not None else None,
+        # Seeded per profile so repeated requests return the same projection
+        seed=profile.id
+    )
+    
+    def money(value):
+        return f'{value:.2f}'
+    
+    return Response({
+        'initial_amount': money(inputs['initial']),
+        'monthly_contribution': money(options['monthly_contribution']),
+        'expected_annual_return': round(inputs['annual_return'] * 100, 2),
+        'annual_volatility': round(inputs['annual_volatility'] * 100, 2),
+        'months': result['months'],
+        'paths': result['paths'],
+        'bands': [
+            {'month': band['month'], **{key: money(value) for key, value in band.items() if key != 'month'}}
+            for band in result['bands']
+        ],
+        'final': {key: money(value) for key, value in result['final'].items()},
+        'target': money(target) if target is not None else None,
+        'probability_of_target': result['probability_of_target'],
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_recommendation_history(request):
+    """
+    Get the current user's past recommendations, newest first, one keyset page at a time.
+    
+    Pass the returned next_cursor as ?cursor= to fetch the following page.
+    """
+    profile = request_profile(request)
+    if profile is None:
+        return profile_not_found()
+    
+    try:
+        entries, next_cursor = history_page(
+            profile,
+            request.query_params.get('cursor'),
+            page_size_param(request.query_params.get('page_size'))
+        )
+    except InvalidCursor:
+        return Response({
+            'error': 'Invalid cursor',
+            'message': 'Use the next_cursor value from a previous response'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'history': RecommendationHistorySerializer(entries, many=True, context={'request': request}).data,
+        'next_cursor': next_cursor
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_recommendation_job(request, job_id):
+    """Get the status of a queued recommendation job and its results once finished"""
+    job = get_object_or_404(
+        RecommendationJob.objects.select_related('risk_profile__user'),
+        id=job_id,
+        risk_profile__user=request.user
+    )
+    
+    data = {'job': RecommendationJobSerializer(job, context={'request': request}).data}
+    
+    if job.status == RecommendationJob.STATUS_SUCCEEDED:
+        recommendations = InvestmentRecommendation.objects.filter(
+            id__in=job.result
+        ).select_related('investment', 'risk_profile')
+        data['recommendations'] = recommendation_rows(recommendations, request, job.risk_profile)
+        if data['recommendations'] is None:
+            data['recommendations'] = InvestmentRecommendationSerializer(recommendations, many=True, context={'request': request}).data
+    
+    return Response(data, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_recommendation_cache_stats(request):
+    """Hit/miss counters for the recommendation cache, used to size its buckets"""
+    return Response({
+        'enabled': cache_setting('ENABLED'),
+        'stats': recommendation_cache.stats()
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_recommendation_batching_stats(request):
+    """Fill rate and added latency of batched recommendation generation"""
+    return Response({
+        'enabled': batch_setting('ENABLED'),
+        'stats': recommendation_batcher.stats()
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_llm_client_stats(request):
+    """Circuit breaker state of the LLM client"""
+    return Response(client.stats(), status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_llm_usage(request):
+    """
+    Daily LLM token, latency and fallback aggregates.
+    
+    Optional query parameters: days (default 7), date (YYYY-MM-DD, a single
+    day) and user (user id).
+    """
+    query = LLMUsageQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    options = query.validated_data
+    
+    records = LLMCallRecord.objects.all()
+    
+    if 'date' in options:
+        records = records.filter(created_at__date=options['date'])
+    else:
+        records = records.filter(created_at__gte=timezone.now() - timedelta(days=options['days']))
     
+    if 'user' in options:
+        records = records.filter(user_id=options['user'])
+    
+    return Response(usage_summary(records), status=status.HTTP_200_OK)
+
+def use_job_mode(request):
+    """Whether recommendations should be generated by the background job queue"""
+    requested = request.query_params.get('async')
+    if requested is not None:
+        return requested.lower() in ('1', 'true', 'yes')
+    return job_setting('ENABLED')
+
+RECOMMENDATION_GUIDELINES = """
     Provide 3-5 specific investment recommendations suitable for Kenya. For each recommendation, include:
     1. name: Creative but realistic investment name
     2. type: One of (stocks, bonds, real_estate, money_market, mutual_funds, fixed_deposit, business, agriculture, digital_assets)
@@ -253,26 +456,135 @@ def generate_ai_recommendations(profile):
     - Match risk levels to their tolerance
     - Be practical and accessible
     - Ensure recommended amounts meet minimum requirements
-    
+    """
+
+def describe_profile(profile):
+    """Bullet list of the profile fields the model needs"""
+    return f"""
+    - Age: {profile.age} years
+    - Monthly Income: KSh {profile.monthly_income:,.2f}
+    - Available Investment Amount: KSh {profile.investment_amount:,.2f}
+    - Risk Tolerance: {profile.risk_tolerance}
+    - Investment Timeline: {profile.investment_timeline} months ({profile.investment_timeline_years} years)
+    - Financial Goals: {fit_goals(profile.financial_goals)}
+    """
+
+def build_recommendation_prompt(profile):
+    """Build the user prompt describing a risk profile"""
+    return f"""
+    Based on the following risk profile, generate personalized investment recommendations for Kenya:
+    {describe_profile(profile)}{RECOMMENDATION_GUIDELINES}
     Return ONLY a valid JSON array of investment objects with no additional text.
     """
+
+def build_batch_recommendation_prompt(keyed_profiles):
+    """Build one prompt covering several risk profiles, keyed by profile key"""
+    profiles = ''.join(
+        f"\n    Profile {key}:{describe_profile(profile)}"
+        for key, profile in keyed_profiles
+    )
+    keys = ', '.join(f'"{key}"' for key, _ in keyed_profiles)
+    return f"""
+    Based on each of the following risk profiles, generate personalized investment recommendations for Kenya.
+    Treat every profile independently.
+    {profiles}{RECOMMENDATION_GUIDELINES}
+    Return ONLY a valid JSON object whose keys are the profile keys ({keys}) and whose values are
+    JSON arrays of investment objects for that profile, with no additional text.
+    """
+
+def process_recommendation(rec, profile, total_recommended):
+    """
+    Validate one raw AI recommendation against the profile.
+    
+    Returns the cleaned recommendation, or None if it should be skipped
+    because the profile's investment amount is already allocated.
+    """
+    recommended_amount = Decimal(str(rec.get('recommended_amount', 5000)))
+    
+    # Check if we're not exceeding the total investment amount
+    if total_recommended + recommended_amount > profile.investment_amount:
+        recommended_amount = profile.investment_amount - total_recommended
+        if recommended_amount <= 0:
+            return None
+    
+    return {
+        'name': rec.get('name', 'Investment Option'),
+        'type': rec.get('type', 'mutual_funds'),
+        'minimum_amount': Decimal(str(rec.get('minimum_amount', 1000))),
+        'expected_return': Decimal(str(rec.get('expected_return', 8))),
+        'risk_level': rec.get('risk_level', profile.risk_tolerance),
+        'description': rec.get('description', 'Investment opportunity'),
+        'local_description': rec.get('local_description', 'Fursa ya uwekezaji'),
+        'recommended_amount': recommended_amount,
+        'rationale': rec.get('rationale', 'AI-generated recommendation'),
+        'confidence_score': min(max(float(rec.get('confidence_score', 0.8)), 0.0), 1.0)
+    }
+
+def recommendation_messages(profile):
+    """Chat messages requesting recommendations for a profile"""
+    return [
+        {
+            "role": "system", 
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user", 
+            "content": build_recommendation_prompt(profile)
+        }
+    ]
+
+def generate_ai_recommendations(profile, fallback=True):
+    """
+    Generate personalized investment recommendations using OpenAI API.
+    
+    Model failures return the local engine's recommendations, unless fallback
+    is False, in which case they raise so a queued job can retry the call.
+    """
+    
+    if settings.RECOMMENDATION_ENGINE == 'local':
+        return local_engine.recommend(profile)
+    
+    if cache_setting('ENABLED'):
+        cached = recommendation_cache.get(profile)
+        if cached:
+            logger.info(f"Serving {len(cached)} cached recommendations for profile {profile.id}")
+            return cached
+    
+    if not client.configured:
+        logger.warning("OpenAI API key not configured, using fallback recommendations")
+        LLMCallTracker('single', OPENAI_MODEL, user_ids=[profile.user_id]).fall_back(LLMCallRecord.REASON_NOT_CONFIGURED)
+        return get_fallback_recommendations(profile)
+    
+    if not client.is_available():
+        if not fallback:
+            raise CircuitOpenError("LLM circuit breaker is open")
+        logger.warning("LLM circuit breaker is open, using fallback recommendations")
+        LLMCallTracker('single', OPENAI_MODEL, user_ids=[profile.user_id]).fall_back(LLMCallRecord.REASON_CIRCUIT_OPEN)
+        return get_fallback_recommendations(profile)
+    
+    if batch_setting('ENABLED'):
+        try:
+            recommendations = recommendation_batcher.submit(profile).result(timeout=batch_setting('TIMEOUT'))
+            if not recommendations:
+                raise ValueError("No valid recommendations generated")
+            return recommendations
+        except Exception as e:
+            logger.error(f"AI batch recommendation error: {e}")
+            if not fallback:
+                raise
+            return get_fallback_recommendations(profile)
+    
+    messages = recommendation_messages(profile)
+    tracker = LLMCallTracker('single', OPENAI_MODEL, messages, user_ids=[profile.user_id])
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using correct model name
-            max_tokens=2000,
+        response = client.create(
+            model=OPENAI_MODEL,
+            max_tokens=completion_budget(messages),
             temperature=0.7,
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are a financial advisor specializing in Kenyan investments. Return only valid JSON arrays."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ]
+            messages=messages
         )
+        tracker.observe(response)
         
         # Parse the AI response
         ai_response = response.choices[0].message.content.strip()
@@ -293,245 +605,352 @@ def generate_ai_recommendations(profile):
         
         for rec in recommendations:
             try:
-                recommended_amount = Decimal(str(rec.get('recommended_amount', 5000)))
-                
-                # Check if we're not exceeding the total investment amount
-                if total_recommended + recommended_amount > profile.investment_amount:
-                    recommended_amount = profile.investment_amount - total_recommended
-                    if recommended_amount <= 0:
-                        continue
-                
-                processed_rec = {
-                    'name': rec.get('name', 'Investment Option'),
-                    'type': rec.get('type', 'mutual_funds'),
-                    'minimum_amount': Decimal(str(rec.get('minimum_amount', 1000))),
-                    'expected_return': Decimal(str(rec.get('expected_return', 8))),
-                    'risk_level': rec.get('risk_level', profile.risk_tolerance),
-                    'description': rec.get('description', 'Investment opportunity'),
-                    'local_description': rec.get('local_description', 'Fursa ya uwekezaji'),
-                    'recommended_amount': recommended_amount,
-                    'rationale': rec.get('rationale', 'AI-generated recommendation'),
-                    'confidence_score': min(max(float(rec.get('confidence_score', 0.8)), 0.0), 1.0)
-                }
-                
-                total_recommended += recommended_amount
-                processed_recommendations.append(processed_rec)
-                
+                processed_rec = process_recommendation(rec, profile, total_recommended)
             except (ValueError, InvalidOperation, TypeError) as e:
                 logger.error(f"Error processing recommendation: {e}")
                 continue
+            
+            if processed_rec is None:
+                continue
+            
+            total_recommended += processed_rec['recommended_amount']
+            processed_recommendations.append(processed_rec)
         
         if not processed_recommendations:
+            tracker.fall_back(LLMCallRecord.REASON_NO_RECOMMENDATIONS)
+            if not fallback:
+                raise ValueError("No valid recommendations generated")
             logger.warning("No valid recommendations generated, using fallback")
             return get_fallback_recommendations(profile)
         
         logger.info(f"Generated {len(processed_recommendations)} AI recommendations")
+        tracker.succeed()
+        
+        if cache_setting('ENABLED'):
+            recommendation_cache.put(profile, processed_recommendations)
+        
         return processed_recommendations
         
     except Exception as e:
         logger.error(f"AI recommendation error: {e}")
+        tracker.fall_back(fallback_reason(e))
+        if not fallback:
+            raise
         return get_fallback_recommendations(profile)
 
-def get_fallback_recommendations(profile):
-    """Fallback recommendations if AI service fails"""
-    logger.info("Using fallback recommendations")
+def generate_batch_recommendations(profiles):
+    """
+    Generate recommendations for several profiles with a single model call.
     
-    # Adjust recommendations based on risk tolerance
-    if profile.risk_tolerance == 'conservative':
-        base_recommendations = [
-            {
-                'name': 'Money Market Fund - Conservative',
-                'type': 'money_market',
-                'minimum_amount': Decimal('1000'),
-                'expected_return': Decimal('7.5'),
-                'risk_level': 'conservative',
-                'description': 'Low-risk investment in short-term securities with stable returns',
-                'local_description': 'Uwekezaji wa hatari kidogo katika dhamana za muda mfupi',
-                'recommended_amount': min(profile.investment_amount * Decimal('0.6'), Decimal('100000')),
-                'rationale': 'Safe starting point for conservative investors seeking capital preservation',
-                'confidence_score': 0.9
-            },
-            {
-                'name': 'Fixed Deposit Account',
-                'type': 'fixed_deposit',
-                'minimum_amount': Decimal('5000'),
-                'expected_return': Decimal('9.0'),
-                'risk_level': 'conservative',
-                'description': 'Fixed-term deposits with guaranteed returns',
-                'local_description': 'Amana za muda maalum na mapato ya hakika',
-                'recommended_amount': min(profile.investment_amount * Decimal('0.4'), Decimal('50000')),
-                'rationale': 'Guaranteed returns with capital protection',
-                'confidence_score': 0.95
-            }
-        ]
-    elif profile.risk_tolerance == 'moderate':
-        base_recommendations = [
-            {
-                'name': 'Balanced Mutual Fund',
-                'type': 'mutual_funds',
-                'minimum_amount': Decimal('2000'),
-                'expected_return': Decimal('12.0'),
-                'risk_level': 'moderate',
-                'description': 'Diversified portfolio of stocks and bonds',
-                'local_description': 'Mfuko wa uwekezaji wenye mchanganyiko wa hisa na dhamana',
-                'recommended_amount': min(profile.investment_amount * Decimal('0.5'), Decimal('75000')),
-                'rationale': 'Balanced approach with moderate risk and return potential',
-                'confidence_score': 0.85
-            },
-            {
-                'name': 'SACCO Investment Shares',
-                'type': 'business',
-                'minimum_amount': Decimal('1000'),
-                'expected_return': Decimal('15.0'),
-                'risk_level': 'moderate',
-                'description': 'Cooperative society investment with annual dividends',
-                'local_description': 'Uwekezaji katika shirika la ushirika na mgao wa kila mwaka',
-                'recommended_amount': min(profile.investment_amount * Decimal('0.3'), Decimal('40000')),
-                'rationale': 'Community-based investment with steady dividend income',
-                'confidence_score': 0.8
-            }
-        ]
-    else:  # aggressive
-        base_recommendations = [
-            {
-                'name': 'NSE Equity Fund',
-                'type': 'stocks',
-                'minimum_amount': Decimal('5000'),
-                'expected_return': Decimal('18.0'),
-                'risk_level': 'aggressive',
-                'description': 'Investment in Nairobi Securities Exchange listed companies',
-                'local_description': 'Uwekezaji katika makampuni yaliyoorodheshwa NSE',
-                'recommended_amount': min(profile.investment_amount * Decimal('0.4'), Decimal('80000')),
-                'rationale': 'High growth potential through equity market exposure',
-                'confidence_score': 0.75
-            },
-            {
-                'name': 'Real Estate Investment Trust',
-                'type': 'real_estate',
-                'minimum_amount': Decimal('10000'),
-                'expected_return': Decimal('16.0'),
-                'risk_level': 'aggressive',
-                'description': 'Investment in commercial and residential properties',
-                'local_description': 'Uwekezaji katika mali za kibiashara na za makazi',
-                'recommended_amount': min(profile.investment_amount * Decimal('0.3'), Decimal('60000')),
-                'rationale': 'Diversification into real estate with potential for capital appreciation',
-                'confidence_score': 0.7
-            }
-        ]
-    
-    return base_recommendations
-
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])  # This can stay AllowAny since it doesn't use request.user
-def get_investment_types(request):
-    """Get available investment types with descriptions"""
-    investment_types = [
-        {
-            'type': 'stocks',
-            'name': 'Stocks',
-            'name_sw': 'Hisa za Kampuni',
-            'description': 'Shares in publicly traded companies on the Nairobi Securities Exchange',
-            'local_description': 'Hisa katika kampuni zinazoorodheshwa NSE',
-            'risk_level': 'aggressive',
-            'typical_return': '15-25%',
-            'minimum_investment': 5000
-        },
-        {
-            'type': 'bonds',
-            'name': 'Bonds',
-            'name_sw': 'Dhamana',
-            'description': 'Government and corporate bonds with fixed returns',
-            'local_description': 'Dhamana za serikali na makampuni na mapato ya kudumu',
-            'risk_level': 'conservative',
-            'typical_return': '8-12%',
-            'minimum_investment': 1000
-        },
-        {
-            'type': 'real_estate',
-            'name': 'Real Estate',
-            'name_sw': 'Mali Isiyohamishika',
-            'description': 'Property investments and REITs',
-            'local_description': 'Uwekezaji wa mali isiyohamishika na REITs',
-            'risk_level': 'moderate',
-            'typical_return': '12-18%',
-            'minimum_investment': 10000
-        },
-        {
-            'type': 'money_market',
-            'name': 'Money Market Fund',
-            'name_sw': 'Soko la Fedha',
-            'description': 'Short-term, low-risk investments in treasury bills and commercial papers',
-            'local_description': 'Uwekezaji wa muda mfupi, hatari kidogo katika hundi za hazina',
-            'risk_level': 'conservative',
-            'typical_return': '6-9%',
-            'minimum_investment': 1000
-        },
-        {
-            'type': 'mutual_funds',
-            'name': 'Mutual Funds',
-            'name_sw': 'Mfuko wa Uongozi',
-            'description': 'Professionally managed investment portfolios',
-            'local_description': 'Mfuko wa uwekezaji unaoongozwa na wataalamu',
-            'risk_level': 'moderate',
-            'typical_return': '10-15%',
-            'minimum_investment': 2000
-        },
-        {
-            'type': 'fixed_deposit',
-            'name': 'Fixed Deposit',
-            'name_sw': 'Amana ya Muda',
-            'description': 'Fixed-term deposits with guaranteed returns',
-            'local_description': 'Amana za muda maalum na mapato ya hakika',
-            'risk_level': 'conservative',
-            'typical_return': '7-10%',
-            'minimum_investment': 5000
-        },
-        {
-            'type': 'business',
-            'name': 'Business Investment',
-            'name_sw': 'Biashara',
-            'description': 'Investment in business ventures, SACCOs, or cooperative societies',
-            'local_description': 'Uwekezaji katika biashara, SACCO, au vyama vya ushirika',
-            'risk_level': 'moderate',
-            'typical_return': '12-20%',
-            'minimum_investment': 1000
-        },
+    Returns one recommendation list per profile, in order. Profiles the model
+    skipped or answered with nothing usable get None, and a failed model call
+    raises, so each caller can fall back or retry on its own terms.
+    """
+    keyed_profiles = [(f"p{index}", profile) for index, profile in enumerate(profiles, start=1)]
+    messages = [
         {
-            'type': 'agriculture',
-            'name': 'Agriculture',
-            'name_sw': 'Kilimo',
-            'description': 'Investment in agricultural projects and agribusiness',
-            'local_description': 'Uwekezaji katika miradi ya kilimo na biashara za kilimo',
-            'risk_level': 'moderate',
-            'typical_return': '10-16%',
-            'minimum_investment': 3000
+            "role": "system",
+            "content": BATCH_SYSTEM_PROMPT
         },
         {
-            'type': 'digital_assets',
-            'name': 'Digital Assets',
-            'name_sw': 'Mali za Kidijitali',
-            'description': 'Investment in digital currencies and blockchain-based assets',
-            'local_description': 'Uwekezaji katika sarafu za kidijitali na mali za blockchain',
-            'risk_level': 'aggressive',
-            'typical_return': '15-30%',
-            'minimum_investment': 1000
+            "role": "user",
+            "content": build_batch_recommendation_prompt(keyed_profiles)
         }
     ]
+    tracker = LLMCallTracker('batch', OPENAI_MODEL, messages, user_ids=[profile.user_id for profile in profiles])
     
-    return Response({
-        'investment_types': investment_types,
-        'message': 'Available investment types for Kenya',
-        'total_types': len(investment_types)
-    }, status=status.HTTP_200_OK)
+    try:
+        response = client.create(
+            model=OPENAI_MODEL,
+            max_tokens=min(completion_budget(messages, profiles=len(profiles)), 16000),
+            temperature=0.7,
+            messages=messages
+        )
+        tracker.observe(response)
+        
+        ai_response = response.choices[0].message.content.strip()
+        json_start = ai_response.find('{')
+        json_end = ai_response.rfind('}') + 1
+        
+        if json_start == -1 or json_end == 0:
+            raise ValueError("No valid JSON object found in AI response")
+        
+        keyed_recommendations = json.loads(ai_response[json_start:json_end])
+        if not isinstance(keyed_recommendations, dict):
+            raise ValueError("AI response is not a JSON object")
+    
+    except Exception as e:
+        logger.error(f"AI batch recommendation error: {e}")
+        tracker.fall_back(fallback_reason(e))
+        raise
+    
+    results = []
+    for key, profile in keyed_profiles:
+        processed_recommendations = []
+        total_recommended = Decimal('0')
+        
+        raw_recommendations = keyed_recommendations.get(key)
+        for rec in raw_recommendations if isinstance(raw_recommendations, list) else []:
+            try:
+                processed_rec = process_recommendation(rec, profile, total_recommended)
+            except (ValueError, InvalidOperation, TypeError, AttributeError) as e:
+                logger.error(f"Error processing recommendation: {e}")
+                continue
+            
+            if processed_rec is None:
+                continue
+            
+            total_recommended += processed_rec['recommended_amount']
+            processed_recommendations.append(processed_rec)
+        
+        if not processed_recommendations:
+            logger.warning(f"No valid recommendations for batched profile {key}")
+            results.append(None)
+            continue
+        
+        if cache_setting('ENABLED'):
+            recommendation_cache.put(profile, processed_recommendations)
+        results.append(processed_recommendations)
+    
+    logger.info(f"Generated AI recommendations for a batch of {len(profiles)} profiles")
+    
+    if any(keyed_recommendations.get(key) for key, _ in keyed_profiles):
+        tracker.succeed()
+    else:
+        tracker.fall_back(LLMCallRecord.REASON_NO_RECOMMENDATIONS)
+    return results
+
+recommendation_batcher = RecommendationBatcher.from_settings(generate_batch_recommendations)
+
+def stream_ai_recommendations(profile):
+    """
+    Yield validated recommendations one at a time as the model streams them.
+    
+    Falls back to the local engine if nothing usable arrives.
+    """
+    if settings.RECOMMENDATION_ENGINE == 'local':
+        yield from local_engine.recommend(profile)
+        return
+    
+    if cache_setting('ENABLED'):
+        cached = recommendation_cache.get(profile)
+        if cached:
+            yield from cached
+            return
+    
+    if not client.configured:
+        logger.warning("OpenAI API key not configured, using fallback recommendations")
+        LLMCallTracker('stream', OPENAI_MODEL, user_ids=[profile.user_id]).fall_back(LLMCallRecord.REASON_NOT_CONFIGURED)
+        yield from get_fallback_recommendations(profile)
+        return
+    
+    if not client.is_available():
+        logger.warning("LLM circuit breaker is open, using fallback recommendations")
+        LLMCallTracker('stream', OPENAI_MODEL, user_ids=[profile.user_id]).fall_back(LLMCallRecord.REASON_CIRCUIT_OPEN)
+        yield from get_fallback_recommendations(profile)
+        return
+    
+    processed_recommendations = []
+    total_recommended = Decimal('0')
+    messages = recommendation_messages(profile)
+    tracker = LLMCallTracker('stream', OPENAI_MODEL, messages, user_ids=[profile.user_id])
+    completed = False
+    
+    try:
+        stream = client.stream(
+            model=OPENAI_MODEL,
+            max_tokens=completion_budget(messages),
+            temperature=0.7,
+            messages=messages,
+            stream_options={'include_usage': True}
+        )
+        
+        parser = JSONArrayStreamParser()
+        for chunk in stream:
+            if chunk.usage:
+                tracker.observe(chunk)
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ''
+            tracker.observe_text(text)
+            for rec in parser.feed(text):
+                try:
+                    processed_rec = process_recommendation(rec, profile, total_recommended)
+                except (ValueError, InvalidOperation, TypeError, AttributeError) as e:
+                    logger.error(f"Error processing recommendation: {e}")
+                    continue
+                
+                if processed_rec is None:
+                    continue
+                
+                total_recommended += processed_rec['recommended_amount']
+                processed_recommendations.append(processed_rec)
+                yield processed_rec
+        
+        completed = True
+    except Exception as e:
+        logger.error(f"AI recommendation stream error: {e}")
+        tracker.fall_back(fallback_reason(e))
+    
+    if not processed_recommendations:
+        logger.warning("No valid recommendations streamed, using fallback")
+        tracker.fall_back(LLMCallRecord.REASON_NO_RECOMMENDATIONS)
+        yield from get_fallback_recommendations(profile)
+        return
+    
+    if not completed:
+        # This user keeps what already streamed, but a cut-off set must not be
+        # served to the rest of the cache bucket
+        logger.warning(f"Stream failed after {len(processed_recommendations)} AI recommendations, not caching them")
+        return
+    
+    logger.info(f"Streamed {len(processed_recommendations)} AI recommendations")
+    tracker.succeed()
+    
+    if cache_setting('ENABLED'):
+        recommendation_cache.put(profile, processed_recommendations)
+
+def get_fallback_recommendations(profile):
+    """Fallback recommendations if AI service fails, from the local engine"""
+    logger.info("Using fallback recommendations")
+    return local_engine.recommend(profile)
+
+INVESTMENT_TYPES = [
+    {
+        'type': 'stocks',
+        'name': 'Stocks',
+        'name_sw': 'Hisa za Kampuni',
+        'description': 'Shares in publicly traded companies on the Nairobi Securities Exchange',
+        'local_description': 'Hisa katika kampuni zinazoorodheshwa NSE',
+        'risk_level': 'aggressive',
+        'typical_return': '15-25%',
+        'minimum_investment': 5000
+    },
+    {
+        'type': 'bonds',
+        'name': 'Bonds',
+        'name_sw': 'Dhamana',
+        'description': 'Government and corporate bonds with fixed returns',
+        'local_description': 'Dhamana za serikali na makampuni na mapato ya kudumu',
+        'risk_level': 'conservative',
+        'typical_return': '8-12%',
+        'minimum_investment': 1000
+    },
+    {
+        'type': 'real_estate',
+        'name': 'Real Estate',
+        'name_sw': 'Mali Isiyohamishika',
+        'description': 'Property investments and REITs',
+        'local_description': 'Uwekezaji wa mali isiyohamishika na REITs',
+        'risk_level': 'moderate',
+        'typical_return': '12-18%',
+        'minimum_investment': 10000
+    },
+    {
+        'type': 'money_market',
+        'name': 'Money Market Fund',
+        'name_sw': 'Soko la Fedha',
+        'description': 'Short-term, low-risk investments in treasury bills and commercial papers',
+        'local_description': 'Uwekezaji wa muda mfupi, hatari kidogo katika hundi za hazina',
+        'risk_level': 'conservative',
+        'typical_return': '6-9%',
+        'minimum_investment': 1000
+    },
+    {
+        'type': 'mutual_funds',
+        'name': 'Mutual Funds',
+        'name_sw': 'Mfuko wa Uongozi',
+        'description': 'Professionally managed investment portfolios',
+        'local_description': 'Mfuko wa uwekezaji unaoongozwa na wataalamu',
+        'risk_level': 'moderate',
+        'typical_return': '10-15%',
+        'minimum_investment': 2000
+    },
+    {
+        'type': 'fixed_deposit',
+        'name': 'Fixed Deposit',
+        'name_sw': 'Amana ya Muda',
+        'description': 'Fixed-term deposits with guaranteed returns',
+        'local_description': 'Amana za muda maalum na mapato ya hakika',
+        'risk_level': 'conservative',
+        'typical_return': '7-10%',
+        'minimum_investment': 5000
+    },
+    {
+        'type': 'business',
+        'name': 'Business Investment',
+        'name_sw': 'Biashara',
+        'description': 'Investment in business ventures, SACCOs, or cooperative societies',
+        'local_description': 'Uwekezaji katika biashara, SACCO, au vyama vya ushirika',
+        'risk_level': 'moderate',
+        'typical_return': '12-20%',
+        'minimum_investment': 1000
+    },
+    {
+        'type': 'agriculture',
+        'name': 'Agriculture',
+        'name_sw': 'Kilimo',
+        'description': 'Investment in agricultural projects and agribusiness',
+        'local_description': 'Uwekezaji katika miradi ya kilimo na biashara za kilimo',
+        'risk_level': 'moderate',
+        'typical_return': '10-16%',
+        'minimum_investment': 3000
+    },
+    {
+        'type': 'digital_assets',
+        'name': 'Digital Assets',
+        'name_sw': 'Mali za Kidijitali',
+        'description': 'Investment in digital currencies and blockchain-based assets',
+        'local_description': 'Uwekezaji katika sarafu za kidijitali na mali za blockchain',
+        'risk_level': 'aggressive',
+        'typical_return': '15-30%',
+        'minimum_investment': 1000
+    }
+]
+
+# Encoded once at import; the payload only changes with a deploy
+investment_types_response = PrecompiledJSON({
+    'investment_types': INVESTMENT_TYPES,
+    'message': 'Available investment types for Kenya',
+    'total_types': len(INVESTMENT_TYPES)
+})
+
+@require_safe
+def get_investment_types(request):
+    """Get available investment types with descriptions, from precompiled bytes and without authentication"""
+    return investment_types_response.respond(request)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])  # This can stay AllowAny since it doesn't use request.user
 def get_investments(request):
-    """Get all available investments"""
-    investments = Investment.objects.filter(is_active=True)
-    serializer = InvestmentSummarySerializer(investments, many=True)
+    """
+    Get available investments, filtered, searched and sorted, one keyset page at a time.
+    
+    Pass the returned next_cursor as ?cursor= to fetch the following page.
+    """
+    query = InvestmentQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    filters = query.validated_data
+    
+    investments = filter_investments(Investment.objects.filter(is_active=True), filters)
+    try:
+        page, next_cursor = keyset_page(
+            investments,
+            request.query_params.get('cursor'),
+            page_size_param(request.query_params.get('page_size')),
+            filters['sort']
+        )
+    except InvalidCursor:
+        return Response({
+            'error': 'Invalid cursor',
+            'message': 'Use the next_cursor value from a previous response with the same sort'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    filters_key = repr(sorted((key, value) for key, value in filters.items() if key != 'sort'))
     
     return Response({
-        'investments': serializer.data,
-        'total_count': investments.count()
+        'investments': investment_summary_rows(page, request),
+        'total_count': investment_count(investments, filters_key),
+        'next_cursor': next_cursor
     }, status=status.HTTP_200_OK)
\ No newline at end of file
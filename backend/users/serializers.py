@@ -3,6 +3,70 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from .models import User
 
+# Languages a client can select with ?lang=
+LANGUAGES = ('en', 'sw')
+
+
+def _split(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Lets the request trim a serializer's output through query parameters.
+
+    ?fields=a,b          keeps only these fields on top-level serializers
+    ?fields[<type>]=a,b  keeps only these fields wherever a serializer whose
+                         Meta.resource_name is <type> appears, nested or not
+    ?expand=a,a.b        renders expandable_fields as nested objects instead of
+                         ids; dotted paths reach into nested serializers
+    ?lang=en|sw          keeps only one language of Meta.language_fields
+
+    The request is read from the serializer context, and serializers bound to
+    input data are never trimmed.
+    """
+    expandable_fields = {}
+
+    def _path(self):
+        """Dotted position of this serializer within the root serializer"""
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or hasattr(self, 'initial_data'):
+            return fields
+
+        params = getattr(request, 'query_params', request.GET)
+        path = self._path()
+
+        expand = _split(params.get('expand'))
+        for name, serializer_class in self.expandable_fields.items():
+            if name in fields and (f"{path}.{name}" if path else name) in expand:
+                fields[name] = serializer_class(read_only=True)
+
+        resource_name = getattr(self.Meta, 'resource_name', None)
+        selected = _split(params.get(f'fields[{resource_name}]')) if resource_name else set()
+        if not selected and not path:
+            selected = _split(params.get('fields'))
+        if selected:
+            fields = {name: field for name, field in fields.items() if name in selected}
+
+        lang = params.get('lang')
+        if lang in LANGUAGES:
+            for code, names in getattr(self.Meta, 'language_fields', {}).items():
+                if code != lang:
+                    for name in names:
+                        fields.pop(name, None)
+
+        return fields
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
@@ -54,8 +118,9 @@ class UserLoginSerializer(serializers.Serializer):
         else:
             raise serializers.ValidationError('Both email and password are required.')
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
+        resource_name = 'user'
         fields = ('id', 'email', 'username', 'full_name', 'phone_number', 'id_number', 'is_verified', 'date_joined')
         read_only_fields = ('id', 'date_joined', 'is_verified')
\ No newline at end of file
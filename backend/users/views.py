@@ -23,7 +23,7 @@ def register_view(request):
     if serializer.is_valid():
         user = serializer.save()
         tokens = get_tokens_for_user(user)
-        user_data = UserSerializer(user).data
+        user_data = UserSerializer(user, context={'request': request}).data
         
         return Response({
             'message': 'User registered successfully',
@@ -42,7 +42,7 @@ def login_view(request):
     if serializer.is_valid():
         user = serializer.validated_data['user']
         tokens = get_tokens_for_user(user)
-        user_data = UserSerializer(user).data
+        user_data = UserSerializer(user, context={'request': request}).data
         
         return Response({
             'message': 'Login successful',
@@ -58,13 +58,13 @@ def login_view(request):
 @api_view(['GET'])
 def profile_view(request):
     """Get user profile (requires authentication)"""
-    serializer = UserSerializer(request.user)
+    serializer = UserSerializer(request.user, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 @api_view(['PUT', 'PATCH'])
 def update_profile_view(request):
     """Update user profile (requires authentication)"""
-    serializer = UserSerializer(request.user, data=request.data, partial=True)
+    serializer = UserSerializer(request.user, data=request.data, partial=True, context={'request': request})
     if serializer.is_valid():
         serializer.save()
         return Response({